@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ CSV Reader
+                                 A QGIS plugin module
+ Read delimited text files for preview and import
+                              -------------------
+        begin                : 2025-12-21
+        copyright            : (C) 2025 by Mirjan Ali Sha
+        email                : mastools.help@gmail.com
+ ***************************************************************************/
+"""
+
+import csv
+import codecs
+import io
+import mmap
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, List, Optional
+
+from qgis.core import QgsMessageLog, Qgis
+
+# pandas is optional; its C tokenizer is much faster on large files
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# Encoding detectors are optional, cchardet being the faster of the two
+try:
+    import cchardet
+except ImportError:
+    cchardet = None
+try:
+    import charset_normalizer
+except ImportError:
+    charset_normalizer = None
+
+# Byte order marks; UTF-32 first since its little-endian BOM starts with UTF-16's
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Bytes read from the start of a file to detect its encoding
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Characters read from the start of a file to sniff its delimiter
+DELIMITER_SAMPLE_SIZE = 4096
+
+# Files at least this large are tokenized by pandas in parallel chunks
+PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+
+# Numbers that round-trip through int()/float() without losing text such
+# as leading zeros; integers are limited to what fits in a 64-bit field
+_INT_RE = re.compile(r'[-+]?(?:0|[1-9][0-9]{0,17})')
+_FLOAT_RE = re.compile(
+    r'[-+]?(?:(?:0|[1-9][0-9]*)(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][-+]?[0-9]+)?'
+)
+
+# Significant decimal digits a double always keeps (DBL_DIG)
+_FLOAT_DIGITS = 15
+
+# Integers above this lose precision as doubles
+_FLOAT_INT_MAX = 2 ** 53
+
+
+def read_csv_rows(path: str, delimiter: str, encoding: str,
+                  max_rows: Optional[int] = None) -> List[List[str]]:
+    """
+    Read a delimited text file into rows of strings.
+
+    Uses pandas when it is installed and falls back to the csv module when
+    it is not, or when pandas cannot tokenize the file (for example rows
+    with more fields than the first one).
+
+    :param path: Path to the CSV file
+    :param delimiter: Field delimiter character
+    :param encoding: File encoding; undecodable bytes are replaced
+    :param max_rows: Stop after this many rows (None reads the whole file)
+    :return: List of rows, each a list of field values
+    """
+    if pd is not None:
+        try:
+            if (max_rows is None and os.path.getsize(path) >= PARALLEL_MIN_SIZE
+                    and '\n"'.encode(encoding) == b'\n"'):
+                return _read_csv_rows_parallel(path, delimiter, encoding)
+            return _pandas_read(path, delimiter, encoding, max_rows).values.tolist()
+        except Exception as e:
+            QgsMessageLog.logMessage(
+                f"pandas could not read CSV, using csv module: {str(e)}",
+                'CSV Geometry Import', Qgis.Info
+            )
+
+    with codecs.open(path, 'r', encoding=encoding, errors='replace') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        if max_rows is None:
+            return list(reader)
+        return list(islice(reader, max_rows))
+
+
+def _pandas_read(source, delimiter: str, encoding: str, max_rows: Optional[int] = None):
+    """Read a path or binary buffer into a DataFrame of strings, keeping empty values"""
+    return pd.read_csv(
+        source, sep=delimiter, encoding=encoding, encoding_errors='replace',
+        header=None, nrows=max_rows, dtype=str, engine='c',
+        keep_default_na=False, na_filter=False, skip_blank_lines=False
+    )
+
+
+def _split_offsets(data: bytes, parts: int) -> List[int]:
+    """
+    Split data into about `parts` ranges at newlines outside quoted fields.
+
+    A newline is outside quotes when an even number of '"' precede it in
+    the current range; escaped quotes ("") keep the count even.
+
+    :return: Range boundaries, starting with 0 and ending with len(data)
+    """
+    size = len(data)
+    offsets = [0]
+    for k in range(1, parts):
+        start = offsets[-1]
+        pos = max(size * k // parts, start)
+        quotes = data.count(b'"', start, pos)
+        while True:
+            newline = data.find(b'\n', pos)
+            if newline < 0:
+                pos = size
+                break
+            quotes += data.count(b'"', pos, newline)
+            pos = newline + 1
+            if quotes % 2 == 0:
+                break
+        if pos >= size:
+            break
+        offsets.append(pos)
+    offsets.append(size)
+    return offsets
+
+
+def _read_csv_rows_parallel(path: str, delimiter: str, encoding: str) -> List[List[str]]:
+    """
+    Tokenize a large file with pandas in newline-aligned chunks on threads.
+
+    The pandas C tokenizer releases the GIL, so chunks are parsed
+    concurrently; processes are not used as QGIS cannot fork its
+    interpreter safely. Only for encodings where newline and '"' are
+    single ASCII bytes.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    workers = os.cpu_count() or 1
+    offsets = _split_offsets(data, workers)
+    ranges = list(zip(offsets, offsets[1:]))
+
+    def read_range(bounds):
+        start, end = bounds
+        return _pandas_read(io.BytesIO(data[start:end]), delimiter, encoding)
+
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        frames = list(executor.map(read_range, ranges))
+
+    rows = []
+    for df in frames:
+        rows.extend(df.values.tolist())
+    return rows
+
+
+def read_csv_head(path: str, delimiter: str, encoding: str, max_rows: int) -> List[List[str]]:
+    """
+    Read the first rows of a delimited text file without reading the rest.
+
+    The file is memory-mapped and only the bytes up to the last needed
+    newline are decoded. Encodings whose newline is not the single byte
+    0x0A (UTF-16, UTF-32) go through read_csv_rows instead.
+
+    :param path: Path to the CSV file
+    :param delimiter: Field delimiter character
+    :param encoding: File encoding; undecodable bytes are replaced
+    :param max_rows: Number of rows to read
+    :return: List of rows, each a list of field values
+    """
+    if '\n'.encode(encoding) != b'\n':
+        return read_csv_rows(path, delimiter, encoding, max_rows=max_rows)
+    if os.path.getsize(path) == 0:
+        return []
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        lines = max_rows + 1
+        while True:
+            # End of the first `lines` lines, or of the file
+            end = 0
+            for _ in range(lines):
+                end = mm.find(b'\n', end) + 1
+                if end == 0:
+                    end = size
+                    break
+            text = mm[:end].decode(encoding, errors='replace')
+            rows = list(islice(csv.reader(io.StringIO(text), delimiter=delimiter), max_rows + 1))
+            # The last row may be cut inside a quoted field; the ones before
+            # it are complete. Read more lines until max_rows of those exist.
+            if len(rows) > max_rows or end >= size:
+                return rows[:max_rows]
+            lines *= 2
+
+
+def detect_encoding(path: str) -> Optional[str]:
+    """
+    Guess the encoding of a file from its first 64 KiB.
+
+    A byte order mark wins, then UTF-8 if the sample decodes as such, then
+    cchardet or charset_normalizer when installed.
+
+    :param path: Path to the file
+    :return: Python codec name, or None if no guess could be made
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(ENCODING_SAMPLE_SIZE)
+    if not sample:
+        return None
+
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    try:
+        # Not final: the sample may end inside a multi-byte character
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    if cchardet is not None:
+        encoding = cchardet.detect(sample).get('encoding')
+        if encoding:
+            return encoding
+    if charset_normalizer is not None:
+        best = charset_normalizer.from_bytes(sample).best()
+        if best is not None:
+            return best.encoding
+    return None
+
+
+def sniff_delimiter(path: str, encoding: str, delimiters: str = ',;\t|') -> Optional[str]:
+    """
+    Guess the field delimiter from the start of a file.
+
+    :param path: Path to the file
+    :param encoding: File encoding; undecodable bytes are replaced
+    :param delimiters: Candidate delimiter characters
+    :return: The delimiter, or None if the sample is inconclusive
+    """
+    with codecs.open(path, 'r', encoding=encoding, errors='replace') as f:
+        sample = f.read(DELIMITER_SAMPLE_SIZE)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=delimiters).delimiter
+    except csv.Error:
+        return None
+
+
+def count_lines(path: str, should_stop: Optional[Callable[[], bool]] = None) -> int:
+    """
+    Count the lines of a file without decoding or tokenizing it.
+
+    Quoted fields spanning several lines are counted once per line, so this
+    is an upper bound on the number of CSV records.
+
+    :param path: Path to the file
+    :param should_stop: Polled between 1 MiB blocks; return True to abort
+    :return: Number of lines, or -1 if aborted
+    """
+    count = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        for buf in iter(lambda: f.read(1 << 20), b''):
+            if should_stop is not None and should_stop():
+                return -1
+            count += buf.count(b'\n')
+            last = buf[-1:]
+    # Last line without a trailing newline
+    if last != b'\n':
+        count += 1
+    return count
+
+
+def _significant_digits(value: str) -> int:
+    """Count the significant digits of a value matching _FLOAT_RE"""
+    mantissa = value.lower().partition('e')[0].lstrip('+-')
+    digits = mantissa.replace('.', '').lstrip('0')
+    # Trailing zeros only carry no precision after a decimal point
+    if '.' in mantissa:
+        digits = digits.rstrip('0')
+    return len(digits)
+
+
+def infer_column_type(values: Iterable[str]) -> type:
+    """
+    Find the narrowest type every non-empty value of a column converts to.
+
+    A column is only typed float when every value survives the conversion
+    to a double; long identifiers stay text rather than being rounded.
+
+    :param values: Column values as read from the file
+    :return: int, float or str; str for a column with no values
+    """
+    col_type = None
+    wide_int = False  # An int value that a double cannot hold exactly
+    int_match = _INT_RE.fullmatch
+    float_match = _FLOAT_RE.fullmatch
+    for value in values:
+        if not value:
+            continue
+        if int_match(value):
+            if col_type is None:
+                col_type = int
+            if len(value) > _FLOAT_DIGITS and abs(int(value)) > _FLOAT_INT_MAX:
+                wide_int = True
+        elif float_match(value) and _significant_digits(value) <= _FLOAT_DIGITS:
+            col_type = float
+        else:
+            return str
+        if wide_int and col_type is float:
+            return str
+    return col_type or str
@@ -13,14 +13,274 @@
 
 import json
 import re
-import binascii
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from itertools import accumulate, chain
 from xml.etree import ElementTree as ET
-from typing import Optional, Tuple, List, Union
+from typing import Optional, Tuple, List, Dict, Union, Sequence
 
 from qgis.core import (
     QgsGeometry, QgsPointXY, QgsWkbTypes, QgsMessageLog, Qgis
 )
 
+# orjson is optional; its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Used to decode JSON embedded in a longer string
+_JSON_DECODER = json.JSONDecoder()
+
+
+# Patterns used on every row, compiled once at import time
+_EWKT_RE = re.compile(r'SRID=(\d+);(.+)', re.IGNORECASE)
+_EE_RE = re.compile(r'ee\.Geometry\.(\w+)\s*\(\s*(\[.+\])\s*\)', re.DOTALL)
+# Case-insensitive KML element checks, avoiding a lower-cased copy of the value
+_KML_ELEMENT_RE = re.compile(
+    r'<(?:point|linestring|polygon|multigeometry|linearring|coordinates)', re.IGNORECASE
+)
+_KML_COORDINATES_RE = re.compile(r'<coordinates', re.IGNORECASE)
+# Opening tag (not self-closing) immediately before a KML <coordinates> element
+_KML_PARENT_RE = re.compile(r'<(\w+)[^>]*(?<!/)>\s*')
+
+# WKT geometry keywords grouped by first letter for detect_format dispatch
+_WKT_KEYWORDS = {
+    'C': ('CIRCULARSTRING', 'COMPOUNDCURVE', 'CURVEPOLYGON'),
+    'G': ('GEOMETRYCOLLECTION',),
+    'L': ('LINESTRING',),
+    'M': ('MULTIPOINT', 'MULTILINESTRING', 'MULTIPOLYGON', 'MULTICURVE', 'MULTISURFACE'),
+    'P': ('POINT', 'POLYGON', 'POLYHEDRALSURFACE'),
+    'T': ('TRIANGLE', 'TIN'),
+}
+# Characters allowed right after a WKT keyword ('' means end of string)
+_WKT_TERMINATORS = frozenset(('', ' ', '(', 'Z', 'M'))
+# Longest keyword plus terminator
+_WKT_HEAD_LEN = 20
+
+# Deletes every hex digit; a pure hex string translates to ''
+_HEX_DELETE_TABLE = str.maketrans('', '', '0123456789ABCDEFabcdef')
+
+# Values longer than this are not memoized; parse_batch still parses
+# repeated values of a column once
+_PARSE_CACHE_MAX_LEN = 512
+
+
+# WKB geometry type codes (2D)
+_WKB_POINT = 1
+_WKB_LINESTRING = 2
+_WKB_POLYGON = 3
+_WKB_MULTIPOINT = 4
+_WKB_MULTILINESTRING = 5
+_WKB_MULTIPOLYGON = 6
+_WKB_GEOMETRYCOLLECTION = 7
+
+
+# Precompiled layouts for the little-endian WKB pieces written per geometry
+_POINT_WKB = struct.Struct('<BIdd')
+# Byte order flag, geometry type and point/ring/member count
+_COUNTED_HEADER_WKB = struct.Struct('<BII')
+_COUNT_WKB = struct.Struct('<I')
+# Packed X/Y of one position
+_XY_WKB = struct.Struct('<dd')
+
+_BIG_ENDIAN_HOST = sys.byteorder == 'big'
+
+
+def _pack_coords(coords: list) -> Tuple[int, bytes]:
+    """
+    Pack the X/Y of every position with at least two values as
+    little-endian doubles.
+    
+    :return: Tuple of (number of points, packed bytes)
+    """
+    positions = [c for c in coords if len(c) >= 2]
+    doubles = array('d', chain.from_iterable(c[:2] for c in positions))
+    if _BIG_ENDIAN_HOST:
+        doubles.byteswap()
+    return len(positions), doubles.tobytes()
+
+
+def _wkb_point(x: float, y: float) -> bytes:
+    """Build a WKB Point"""
+    return _POINT_WKB.pack(1, _WKB_POINT, x, y)
+
+
+def _wkb_linestring(coords: list) -> Optional[bytes]:
+    """Build a WKB LineString, or None if it has fewer than 2 points"""
+    count, packed = _pack_coords(coords)
+    if count < 2:
+        return None
+    return _COUNTED_HEADER_WKB.pack(1, _WKB_LINESTRING, count) + packed
+
+
+def _wkb_polygon(rings: list) -> Optional[bytes]:
+    """
+    Build a WKB Polygon from its rings, dropping rings with fewer than 3
+    points and closing open rings as QgsGeometry.fromPolygonXY does
+    """
+    packed_rings = []
+    xy_size = _XY_WKB.size
+    for ring in rings:
+        count, packed = _pack_coords(ring)
+        if count >= 3:
+            first = packed[:xy_size]
+            if _XY_WKB.unpack(first) != _XY_WKB.unpack(packed[-xy_size:]):
+                packed += first
+                count += 1
+            packed_rings.append(_COUNT_WKB.pack(count) + packed)
+    if not packed_rings:
+        return None
+    return _COUNTED_HEADER_WKB.pack(1, _WKB_POLYGON, len(packed_rings)) + b''.join(packed_rings)
+
+
+def _wkb_multi(wkb_type: int, members: list) -> Optional[bytes]:
+    """Build a WKB multi-geometry from member WKBs, ignoring None members"""
+    members = [m for m in members if m is not None]
+    if not members:
+        return None
+    return _COUNTED_HEADER_WKB.pack(1, wkb_type, len(members)) + b''.join(members)
+
+
+def _geometry_from_wkb(wkb: Optional[bytes]) -> Optional[QgsGeometry]:
+    """Create a QgsGeometry from WKB bytes, passing None through"""
+    if wkb is None:
+        return None
+    geom = QgsGeometry()
+    geom.fromWkb(wkb)
+    return geom
+
+
+def _parse_kml_coordinates(text: str) -> List[Tuple[float, float]]:
+    """
+    Parse the text of a KML <coordinates> element into (lon, lat) pairs.
+    
+    Tuples are "lon,lat[,alt]" separated by whitespace. When every tuple has
+    the same number of values, all numbers are converted in one pass and
+    sliced by stride; otherwise tuples are parsed one by one and malformed
+    ones are skipped.
+    """
+    tuples = text.split()
+    if not tuples:
+        return []
+    
+    commas = {t.count(',') for t in tuples}
+    if len(commas) == 1:
+        stride = commas.pop() + 1
+        values = text.replace(',', ' ').split()
+        if stride >= 2 and len(values) == stride * len(tuples):
+            try:
+                numbers = list(map(float, values))
+            except ValueError:
+                pass
+            else:
+                return list(zip(numbers[0::stride], numbers[1::stride]))
+    
+    points = []
+    for pair in tuples:
+        parts = pair.split(',')
+        if len(parts) >= 2:
+            try:
+                points.append((float(parts[0]), float(parts[1])))
+            except ValueError:
+                continue
+    return points
+
+
+def _is_kml_coordinates_tag(tag: str) -> bool:
+    """Check whether an element tag, possibly namespaced, is coordinates"""
+    return tag.lower().endswith('coordinates')
+
+
+def _scan_kml_coordinates(value: str) -> Optional[Tuple[str, str]]:
+    """
+    Extract the first <coordinates> text and its parent tag name from a KML
+    fragment by plain substring search, without building an XML tree.
+    
+    :return: Tuple of (coordinates text, lower-case parent tag), or None if
+        the fragment needs a full XML parse (namespaced tags, entities,
+        CDATA, or a parent that cannot be read from the preceding tag)
+    """
+    start = value.find('<coordinates>')
+    if start < 0:
+        return None
+    end = value.find('</coordinates>', start)
+    if end < 0:
+        return None
+    
+    coords_text = value[start + len('<coordinates>'):end]
+    if '<' in coords_text or '&' in coords_text:
+        return None
+    
+    tag_start = value.rfind('<', 0, start)
+    if tag_start < 0:
+        return None
+    parent = _KML_PARENT_RE.fullmatch(value, tag_start, start)
+    if parent is None:
+        return None
+    
+    return coords_text, parent.group(1).lower()
+
+
+def _decode_arc(arc: list) -> List[Tuple[float, float]]:
+    """Delta-decode a TopoJSON arc into absolute positions"""
+    positions = [p for p in arc if len(p) >= 2]
+    xs = accumulate(p[0] for p in positions)
+    ys = accumulate(p[1] for p in positions)
+    return list(zip(xs, ys))
+
+
+def _geometry_collection(geoms: List[QgsGeometry]) -> QgsGeometry:
+    """Wrap geometries in a GeometryCollection without merging them"""
+    collection = QgsGeometry()
+    collection.fromWkb(
+        _wkb_multi(_WKB_GEOMETRYCOLLECTION, [bytes(g.asWkb()) for g in geoms])
+    )
+    return collection
+
+
+def _coordinates_to_wkb(geom_type: str, coords: list) -> Optional[bytes]:
+    """
+    Serialize GeoJSON-style nested coordinate arrays directly to WKB.
+    
+    :param geom_type: Lower-case geometry type name (point, multipoint,
+        linestring, multilinestring, polygon, multipolygon)
+    :return: WKB bytes or None if the geometry type is unsupported or
+        has too few coordinates
+    """
+    if geom_type == 'point':
+        if len(coords) >= 2:
+            return _wkb_point(coords[0], coords[1])
+    
+    elif geom_type == 'multipoint':
+        return _wkb_multi(
+            _WKB_MULTIPOINT, [_wkb_point(c[0], c[1]) for c in coords if len(c) >= 2]
+        )
+    
+    elif geom_type == 'linestring':
+        return _wkb_linestring(coords)
+    
+    elif geom_type == 'multilinestring':
+        return _wkb_multi(_WKB_MULTILINESTRING, [_wkb_linestring(line) for line in coords])
+    
+    elif geom_type == 'polygon':
+        return _wkb_polygon(coords)
+    
+    elif geom_type == 'multipolygon':
+        return _wkb_multi(_WKB_MULTIPOLYGON, [_wkb_polygon(polygon) for polygon in coords])
+    
+    return None
+
+
+def _geojson_to_wkb(geojson: dict) -> Optional[bytes]:
+    """Serialize a GeoJSON geometry dict directly to WKB"""
+    return _coordinates_to_wkb(
+        geojson.get('type', '').lower(), geojson.get('coordinates', [])
+    )
+
 
 class GeometryFormat:
     """Enum-like class for geometry format types"""
@@ -53,6 +313,10 @@ class GeometryParser:
     Supports: WKT, WKB, EWKT, EWKB, GeoJSON, KML, Earth Engine, TopoJSON, X-Y
     """
     
+    # Geometry type of the first parsable sample, keyed by (format, sample)
+    _type_cache: Dict[Tuple[str, str], int] = {}
+    _TYPE_CACHE_MAX_SIZE = 256
+    
     @staticmethod
     def detect_format(sample: str) -> str:
         """
@@ -63,36 +327,26 @@ class GeometryParser:
         """
         if not sample or not isinstance(sample, str):
             return GeometryFormat.UNKNOWN
-            
+        
+        # Long samples are not memoized so the cache cannot pin them
+        if len(sample) > _PARSE_CACHE_MAX_LEN:
+            return GeometryParser._detect_format(sample)
+        return _detect_format_cached(sample)
+    
+    @staticmethod
+    def _detect_format(sample: str) -> str:
+        """Uncached implementation of detect_format"""
         sample = sample.strip()
         
         if not sample:
             return GeometryFormat.UNKNOWN
         
-        # EWKT: starts with SRID=
-        if sample.upper().startswith('SRID='):
-            return GeometryFormat.EWKT
-        
-        # WKT: starts with geometry type keyword
-        wkt_types = [
-            'POINT', 'LINESTRING', 'POLYGON', 'MULTIPOINT',
-            'MULTILINESTRING', 'MULTIPOLYGON', 'GEOMETRYCOLLECTION',
-            'CIRCULARSTRING', 'COMPOUNDCURVE', 'CURVEPOLYGON',
-            'MULTICURVE', 'MULTISURFACE', 'TRIANGLE', 'TIN',
-            'POLYHEDRALSURFACE'
-        ]
-        upper_sample = sample.upper()
-        for wkt_type in wkt_types:
-            if upper_sample.startswith(wkt_type):
-                # Check if it's followed by space, Z, M, ZM, or (
-                rest = upper_sample[len(wkt_type):]
-                if not rest or rest[0] in ' (ZM':
-                    return GeometryFormat.WKT
-        
-        # GeoJSON: JSON with "type" and "coordinates" or "geometries"
-        if sample.startswith('{'):
+        first = sample[0]
+        
+        # GeoJSON / TopoJSON: JSON object
+        if first == '{':
             try:
-                parsed = json.loads(sample)
+                parsed = _json_loads(sample)
                 if isinstance(parsed, dict):
                     if 'type' in parsed and ('coordinates' in parsed or 'geometries' in parsed):
                         return GeometryFormat.GEOJSON
@@ -102,37 +356,47 @@ class GeometryParser:
                 pass
         
         # KML: XML with Point, LineString, Polygon, etc.
-        if sample.startswith('<') or '<coordinates' in sample.lower():
-            kml_elements = ['<point', '<linestring', '<polygon', '<multigeometry', 
-                           '<linearring', '<coordinates']
-            lower_sample = sample.lower()
-            if any(elem in lower_sample for elem in kml_elements):
+        elif first == '<':
+            if _KML_ELEMENT_RE.search(sample):
                 return GeometryFormat.KML
+            return GeometryFormat.UNKNOWN
         
         # Earth Engine: ee.Geometry pattern
-        if sample.startswith('ee.Geometry'):
+        elif first == 'e' and sample.startswith('ee.Geometry'):
             return GeometryFormat.EARTH_ENGINE
         
-        # WKB/EWKB: hex string (only hex chars, even length)
-        if len(sample) >= 2 and len(sample) % 2 == 0:
-            if all(c in '0123456789ABCDEFabcdef' for c in sample):
-                # Check for EWKB - has SRID flag in byte 5
-                # First byte is byte order (01 = little endian, 00 = big endian)
-                # Bytes 2-5 are geometry type (with SRID flag)
-                try:
+        else:
+            # Only the head is needed for keyword checks
+            upper_head = sample[:_WKT_HEAD_LEN].upper()
+            
+            # EWKT: starts with SRID=
+            if upper_head.startswith('SRID='):
+                return GeometryFormat.EWKT
+            
+            # WKT: starts with geometry type keyword followed by space, Z, M, ZM, or (
+            keywords = _WKT_KEYWORDS.get(upper_head[0])
+            if keywords and upper_head.startswith(keywords):
+                for keyword in keywords:
+                    if (upper_head.startswith(keyword)
+                            and upper_head[len(keyword):len(keyword) + 1] in _WKT_TERMINATORS):
+                        return GeometryFormat.WKT
+            
+            # WKB/EWKB: hex string (only hex chars, even length)
+            if len(sample) >= 2 and len(sample) % 2 == 0:
+                if not sample.translate(_HEX_DELETE_TABLE):
+                    # Check for EWKB - has SRID flag in byte 5
+                    # First byte is byte order (01 = little endian, 00 = big endian)
+                    # Bytes 2-5 are geometry type (with SRID flag)
                     if len(sample) >= 10:
-                        # For little endian, check if SRID flag (0x20) is set
-                        type_bytes = sample[2:10]
-                        type_int = int(type_bytes, 16)
-                        # Little endian, so we need to reverse bytes
-                        if sample[0:2].lower() == '01':
-                            # Little endian - reverse the bytes
-                            type_int = int(''.join(reversed([type_bytes[i:i+2] for i in range(0, 8, 2)])), 16)
+                        fmt = '<I' if sample[0:2] == '01' else '>I'
+                        type_int = struct.unpack(fmt, bytes.fromhex(sample[2:10]))[0]
                         if type_int & 0x20000000:  # SRID flag
                             return GeometryFormat.EWKB
                     return GeometryFormat.WKB
-                except ValueError:
-                    pass
+        
+        # KML fragment not starting with a tag
+        if '<' in sample and _KML_COORDINATES_RE.search(sample):
+            return GeometryFormat.KML
         
         return GeometryFormat.UNKNOWN
     
@@ -159,6 +423,52 @@ class GeometryParser:
         if not value:
             return None
         
+        if len(value) > _PARSE_CACHE_MAX_LEN:
+            return GeometryParser._parse_value(value, format_type)
+        
+        # Hand out a copy so callers cannot modify the cached geometry
+        geom = _parse_cached(value, format_type)
+        return QgsGeometry(geom) if geom is not None else None
+    
+    @staticmethod
+    def clear_caches():
+        """Release the geometries memoized by parse() once an import is done"""
+        _parse_cached.cache_clear()
+    
+    @staticmethod
+    def parse_batch(values: Sequence[str], format_type: str, srid: int = 4326,
+                    parsed: Optional[Dict[str, Optional[QgsGeometry]]] = None
+                    ) -> List[Optional[QgsGeometry]]:
+        """
+        Parse a column of geometry strings.
+        
+        Identical values are parsed once; every row still gets its own
+        QgsGeometry. For X-Y columns use parse_xy_batch instead.
+        
+        :param values: Geometry strings to parse
+        :param format_type: Geometry format (from GeometryFormat)
+        :param srid: Spatial reference ID (used for some formats)
+        :param parsed: Geometries by value, shared by calls parsing slices
+            of the same column
+        :return: List of QgsGeometry, with None where parsing failed
+        """
+        parse = GeometryParser.parse
+        if parsed is None:
+            parsed = {}
+        geoms = []
+        for value in values:
+            if value in parsed:
+                geom = parsed[value]
+                geoms.append(QgsGeometry(geom) if geom is not None else None)
+            else:
+                # parse() already returns a copy the first row can keep
+                geom = parsed[value] = parse(value, format_type, srid)
+                geoms.append(geom)
+        return geoms
+    
+    @staticmethod
+    def _parse_value(value: str, format_type: str) -> Optional[QgsGeometry]:
+        """Parse a stripped, non-empty geometry string of a known format"""
         try:
             if format_type == GeometryFormat.WKT:
                 return GeometryParser._parse_wkt(value)
@@ -193,7 +503,8 @@ class GeometryParser:
     def _parse_wkt(value: str) -> Optional[QgsGeometry]:
         """Parse WKT geometry string"""
         geom = QgsGeometry.fromWkt(value)
-        if geom.isNull() or geom.isEmpty():
+        # isEmpty() is also true for null geometries
+        if geom.isEmpty():
             return None
         return geom
     
@@ -201,13 +512,13 @@ class GeometryParser:
     def _parse_wkb(value: str) -> Optional[QgsGeometry]:
         """Parse WKB hex string"""
         try:
-            wkb_bytes = binascii.unhexlify(value)
+            wkb_bytes = bytes.fromhex(value)
             geom = QgsGeometry()
             geom.fromWkb(wkb_bytes)
-            if geom.isNull() or geom.isEmpty():
+            if geom.isEmpty():
                 return None
             return geom
-        except (binascii.Error, ValueError) as e:
+        except ValueError as e:
             QgsMessageLog.logMessage(
                 f"WKB parsing error: {str(e)}",
                 'CSV Geometry Import', Qgis.Warning
@@ -222,7 +533,7 @@ class GeometryParser:
         
         :return: Tuple of (geometry, srid)
         """
-        match = re.match(r'SRID=(\d+);(.+)', value, re.IGNORECASE)
+        match = _EWKT_RE.match(value)
         if match:
             srid = int(match.group(1))
             wkt_part = match.group(2)
@@ -237,13 +548,13 @@ class GeometryParser:
         The SRID is encoded in the type bytes with flag 0x20000000.
         """
         try:
-            wkb_bytes = binascii.unhexlify(value)
+            wkb_bytes = bytes.fromhex(value)
             geom = QgsGeometry()
             geom.fromWkb(wkb_bytes)
-            if geom.isNull() or geom.isEmpty():
+            if geom.isEmpty():
                 return None
             return geom
-        except (binascii.Error, ValueError) as e:
+        except ValueError as e:
             QgsMessageLog.logMessage(
                 f"EWKB parsing error: {str(e)}",
                 'CSV Geometry Import', Qgis.Warning
@@ -254,147 +565,73 @@ class GeometryParser:
     def _parse_geojson(value: str) -> Optional[QgsGeometry]:
         """Parse GeoJSON geometry object"""
         try:
-            geojson = json.loads(value)
-            
-            # Handle Feature wrapper
-            if geojson.get('type') == 'Feature':
-                geojson = geojson.get('geometry', {})
-            
-            geom_type = geojson.get('type', '').lower()
-            coords = geojson.get('coordinates', [])
-            
-            if geom_type == 'point':
-                if len(coords) >= 2:
-                    return QgsGeometry.fromPointXY(QgsPointXY(coords[0], coords[1]))
-            
-            elif geom_type == 'multipoint':
-                points = [QgsPointXY(c[0], c[1]) for c in coords if len(c) >= 2]
-                if points:
-                    return QgsGeometry.fromMultiPointXY(points)
-            
-            elif geom_type == 'linestring':
-                points = [QgsPointXY(c[0], c[1]) for c in coords if len(c) >= 2]
-                if len(points) >= 2:
-                    return QgsGeometry.fromPolylineXY(points)
-            
-            elif geom_type == 'multilinestring':
-                lines = []
-                for line in coords:
-                    points = [QgsPointXY(c[0], c[1]) for c in line if len(c) >= 2]
-                    if len(points) >= 2:
-                        lines.append(points)
-                if lines:
-                    return QgsGeometry.fromMultiPolylineXY(lines)
-            
-            elif geom_type == 'polygon':
-                rings = []
-                for ring in coords:
-                    points = [QgsPointXY(c[0], c[1]) for c in ring if len(c) >= 2]
-                    if len(points) >= 3:
-                        rings.append(points)
-                if rings:
-                    return QgsGeometry.fromPolygonXY(rings)
-            
-            elif geom_type == 'multipolygon':
-                polygons = []
-                for polygon in coords:
-                    rings = []
-                    for ring in polygon:
-                        points = [QgsPointXY(c[0], c[1]) for c in ring if len(c) >= 2]
-                        if len(points) >= 3:
-                            rings.append(points)
-                    if rings:
-                        polygons.append(rings)
-                if polygons:
-                    return QgsGeometry.fromMultiPolygonXY(polygons)
-            
-            elif geom_type == 'geometrycollection':
-                geometries = geojson.get('geometries', [])
-                geom_list = []
-                for g in geometries:
-                    parsed = GeometryParser._parse_geojson(json.dumps(g))
-                    if parsed:
-                        geom_list.append(parsed)
-                if geom_list:
-                    # Combine geometries
-                    combined = geom_list[0]
-                    for g in geom_list[1:]:
-                        combined = combined.combine(g)
-                    return combined
-            
-            return None
-            
+            geojson = _json_loads(value)
         except json.JSONDecodeError as e:
             QgsMessageLog.logMessage(
                 f"GeoJSON parsing error: {str(e)}",
                 'CSV Geometry Import', Qgis.Warning
             )
             return None
+        
+        return GeometryParser._parse_geojson_dict(geojson)
+    
+    @staticmethod
+    def _parse_geojson_dict(geojson: dict) -> Optional[QgsGeometry]:
+        """Parse an already decoded GeoJSON geometry or Feature"""
+        # Handle Feature wrapper
+        if geojson.get('type') == 'Feature':
+            geojson = geojson.get('geometry', {})
+        
+        geom_type = geojson.get('type', '').lower()
+        
+        if geom_type == 'geometrycollection':
+            geometries = geojson.get('geometries', [])
+            geom_list = []
+            for g in geometries:
+                parsed = GeometryParser._parse_geojson_dict(g)
+                if parsed:
+                    geom_list.append(parsed)
+            if geom_list:
+                return _geometry_collection(geom_list)
+            return None
+        
+        return _geometry_from_wkb(_geojson_to_wkb(geojson))
     
     @staticmethod
     def _parse_kml(value: str) -> Optional[QgsGeometry]:
         """Parse KML geometry element"""
         try:
-            # Wrap in root element if needed
-            if not value.strip().startswith('<?xml') and not value.strip().lower().startswith('<kml'):
-                value = f'<root xmlns:gx="http://www.google.com/kml/ext/2.2">{value}</root>'
-            
-            root = ET.fromstring(value)
-            
-            # Find coordinates element
-            coords_elem = None
-            for elem in root.iter():
-                if elem.tag.lower().endswith('coordinates') or elem.tag == 'coordinates':
-                    coords_elem = elem
-                    break
-            
-            if coords_elem is None or coords_elem.text is None:
-                return None
+            # Fast path: simple fragments need no XML tree
+            scanned = _scan_kml_coordinates(value)
+            if scanned is not None:
+                coords_text, parent_tag = scanned
+            else:
+                coords_text, parent_tag = GeometryParser._find_kml_coordinates(value)
+                if coords_text is None:
+                    return None
             
             # Parse coordinates (format: lon,lat,alt lon,lat,alt ...)
-            coords_text = coords_elem.text.strip()
-            coord_pairs = coords_text.split()
-            
-            points = []
-            for pair in coord_pairs:
-                parts = pair.split(',')
-                if len(parts) >= 2:
-                    try:
-                        lon = float(parts[0])
-                        lat = float(parts[1])
-                        points.append(QgsPointXY(lon, lat))
-                    except ValueError:
-                        continue
+            points = _parse_kml_coordinates(coords_text)
             
             if not points:
                 return None
             
-            # Determine geometry type from parent element
-            parent_tag = ''
-            for elem in root.iter():
-                for child in elem:
-                    if child.tag.lower().endswith('coordinates') or child.tag == 'coordinates':
-                        parent_tag = elem.tag.lower()
-                        break
-            
-            # Remove namespace prefix
-            if '}' in parent_tag:
-                parent_tag = parent_tag.split('}')[1]
-            
             if 'point' in parent_tag and len(points) >= 1:
-                return QgsGeometry.fromPointXY(points[0])
+                wkb = _wkb_point(*points[0])
             elif 'linestring' in parent_tag and len(points) >= 2:
-                return QgsGeometry.fromPolylineXY(points)
+                wkb = _wkb_linestring(points)
             elif ('polygon' in parent_tag or 'linearring' in parent_tag) and len(points) >= 3:
-                return QgsGeometry.fromPolygonXY([points])
+                wkb = _wkb_polygon([points])
             elif len(points) == 1:
-                return QgsGeometry.fromPointXY(points[0])
+                wkb = _wkb_point(*points[0])
             elif len(points) >= 3 and points[0] == points[-1]:
-                return QgsGeometry.fromPolygonXY([points])
+                wkb = _wkb_polygon([points])
             elif len(points) >= 2:
-                return QgsGeometry.fromPolylineXY(points)
+                wkb = _wkb_linestring(points)
+            else:
+                return None
             
-            return None
+            return _geometry_from_wkb(wkb)
             
         except ET.ParseError as e:
             QgsMessageLog.logMessage(
@@ -403,6 +640,45 @@ class GeometryParser:
             )
             return None
     
+    @staticmethod
+    def _find_kml_coordinates(value: str) -> Tuple[Optional[str], str]:
+        """
+        Locate the first coordinates element of a KML fragment with a full
+        XML parse.
+        
+        :return: Tuple of (coordinates text or None, lower-case parent tag)
+        """
+        # Wrap in root element if needed
+        head = value.lstrip()[:5]
+        if not head.startswith('<?xml') and head[:4].lower() != '<kml':
+            value = f'<root xmlns:gx="http://www.google.com/kml/ext/2.2">{value}</root>'
+        
+        root = ET.fromstring(value)
+        
+        # Find the first coordinates element and its parent in one walk
+        coords_elem = None
+        parent_tag = ''
+        if _is_kml_coordinates_tag(root.tag):
+            coords_elem = root
+        else:
+            for elem in root.iter():
+                for child in elem:
+                    if _is_kml_coordinates_tag(child.tag):
+                        coords_elem = child
+                        parent_tag = elem.tag.lower()
+                        break
+                if coords_elem is not None:
+                    break
+        
+        if coords_elem is None or coords_elem.text is None:
+            return None, ''
+        
+        # Remove namespace prefix
+        if '}' in parent_tag:
+            parent_tag = parent_tag.split('}')[1]
+        
+        return coords_elem.text, parent_tag
+    
     @staticmethod
     def _parse_earth_engine(value: str) -> Optional[QgsGeometry]:
         """
@@ -414,91 +690,52 @@ class GeometryParser:
         """
         try:
             # Extract geometry type and coordinates
-            match = re.match(
-                r'ee\.Geometry\.(\w+)\s*\(\s*(\[.+\])\s*\)',
-                value.strip(),
-                re.DOTALL
-            )
+            match = _EE_RE.match(value.strip())
             
             if not match:
                 # Try alternate format with dict
-                if '{' in value and 'coordinates' in value:
-                    # Extract JSON part
-                    json_match = re.search(r'\{[^}]+\}', value)
-                    if json_match:
-                        return GeometryParser._parse_geojson(json_match.group())
+                json_start = value.find('{')
+                if json_start >= 0 and 'coordinates' in value:
+                    # Decode the JSON part in place, without slicing it out
+                    geojson, _ = _JSON_DECODER.raw_decode(value, json_start)
+                    if isinstance(geojson, dict):
+                        return GeometryParser._parse_geojson_dict(geojson)
                 return None
             
             geom_type = match.group(1).lower()
             coords_str = match.group(2)
             
             # Parse coordinates as JSON array
-            coords = json.loads(coords_str)
-            
-            if geom_type == 'point':
-                if len(coords) >= 2:
-                    return QgsGeometry.fromPointXY(QgsPointXY(coords[0], coords[1]))
+            coords = _json_loads(coords_str)
             
-            elif geom_type == 'multipoint':
-                points = [QgsPointXY(c[0], c[1]) for c in coords if len(c) >= 2]
-                if points:
-                    return QgsGeometry.fromMultiPointXY(points)
-            
-            elif geom_type == 'linestring':
-                points = [QgsPointXY(c[0], c[1]) for c in coords if len(c) >= 2]
-                if len(points) >= 2:
-                    return QgsGeometry.fromPolylineXY(points)
-            
-            elif geom_type == 'linearring':
-                points = [QgsPointXY(c[0], c[1]) for c in coords if len(c) >= 2]
-                if len(points) >= 3:
-                    return QgsGeometry.fromPolygonXY([points])
+            if geom_type == 'linearring':
+                wkb = _wkb_polygon([coords])
             
             elif geom_type == 'polygon':
                 # coords is [[[x,y], [x,y], ...]] for polygon
+                wkb = None
                 if coords and isinstance(coords[0], list):
                     if coords[0] and isinstance(coords[0][0], list):
                         # Multi-ring polygon
-                        rings = []
-                        for ring in coords:
-                            points = [QgsPointXY(c[0], c[1]) for c in ring if len(c) >= 2]
-                            if len(points) >= 3:
-                                rings.append(points)
-                        if rings:
-                            return QgsGeometry.fromPolygonXY(rings)
+                        wkb = _wkb_polygon(coords)
                     else:
                         # Single ring
-                        points = [QgsPointXY(c[0], c[1]) for c in coords if len(c) >= 2]
-                        if len(points) >= 3:
-                            return QgsGeometry.fromPolygonXY([points])
-            
-            elif geom_type == 'multipolygon':
-                polygons = []
-                for polygon in coords:
-                    rings = []
-                    for ring in polygon:
-                        points = [QgsPointXY(c[0], c[1]) for c in ring if len(c) >= 2]
-                        if len(points) >= 3:
-                            rings.append(points)
-                    if rings:
-                        polygons.append(rings)
-                if polygons:
-                    return QgsGeometry.fromMultiPolygonXY(polygons)
+                        wkb = _wkb_polygon([coords])
             
             elif geom_type == 'rectangle' or geom_type == 'bbox':
                 # [west, south, east, north]
+                wkb = None
                 if len(coords) >= 4:
                     west, south, east, north = coords[0], coords[1], coords[2], coords[3]
-                    points = [
-                        QgsPointXY(west, south),
-                        QgsPointXY(east, south),
-                        QgsPointXY(east, north),
-                        QgsPointXY(west, north),
-                        QgsPointXY(west, south)
-                    ]
-                    return QgsGeometry.fromPolygonXY([points])
+                    wkb = _wkb_polygon([[
+                        (west, south), (east, south), (east, north),
+                        (west, north), (west, south)
+                    ]])
             
-            return None
+            else:
+                wkb = _coordinates_to_wkb(geom_type, coords)
+            
+            return _geometry_from_wkb(wkb)
             
         except (json.JSONDecodeError, ValueError, IndexError) as e:
             QgsMessageLog.logMessage(
@@ -515,11 +752,11 @@ class GeometryParser:
         This implementation handles simple cases and extracted geometries.
         """
         try:
-            topo = json.loads(value)
+            topo = _json_loads(value)
             
             # If it's a simple geometry object with coordinates (already resolved)
             if 'type' in topo and 'coordinates' in topo:
-                return GeometryParser._parse_geojson(value)
+                return GeometryParser._parse_geojson_dict(topo)
             
             # If it has arcs, we need to resolve them
             arcs = topo.get('arcs', [])
@@ -533,7 +770,7 @@ class GeometryParser:
             first_obj = objects[first_obj_name]
             
             # Resolve geometry
-            return GeometryParser._resolve_topojson_geometry(first_obj, arcs)
+            return GeometryParser._resolve_topojson_geometry(first_obj, arcs, {})
             
         except (json.JSONDecodeError, ValueError) as e:
             QgsMessageLog.logMessage(
@@ -543,80 +780,60 @@ class GeometryParser:
             return None
     
     @staticmethod
-    def _resolve_topojson_geometry(obj: dict, arcs: list) -> Optional[QgsGeometry]:
-        """Resolve TopoJSON geometry using arc references"""
-        geom_type = obj.get('type', '').lower()
+    def _resolve_topojson_geometry(obj: dict, arcs: list,
+                                   decoded_arcs: dict) -> Optional[QgsGeometry]:
+        """
+        Resolve TopoJSON geometry using arc references.
         
-        if geom_type == 'point':
-            coords = obj.get('coordinates', [])
-            if len(coords) >= 2:
-                return QgsGeometry.fromPointXY(QgsPointXY(coords[0], coords[1]))
+        :param decoded_arcs: Cache of already decoded arcs by index, shared
+            by all geometries of the topology
+        """
+        geom_type = obj.get('type', '').lower()
         
-        elif geom_type == 'multipoint':
-            coords = obj.get('coordinates', [])
-            points = [QgsPointXY(c[0], c[1]) for c in coords if len(c) >= 2]
-            if points:
-                return QgsGeometry.fromMultiPointXY(points)
+        if geom_type in ('point', 'multipoint'):
+            return _geometry_from_wkb(
+                _coordinates_to_wkb(geom_type, obj.get('coordinates', []))
+            )
         
-        elif geom_type in ('linestring', 'multilinestring', 'polygon', 'multipolygon'):
+        elif geom_type in ('linestring', 'multilinestring', 'polygon'):
             arc_indices = obj.get('arcs', [])
-            resolved_coords = GeometryParser._resolve_arcs(arc_indices, arcs)
-            
-            if geom_type == 'linestring' and resolved_coords:
-                points = [QgsPointXY(c[0], c[1]) for c in resolved_coords[0] if len(c) >= 2]
-                if len(points) >= 2:
-                    return QgsGeometry.fromPolylineXY(points)
-            
-            elif geom_type == 'multilinestring' and resolved_coords:
-                lines = []
-                for line_coords in resolved_coords:
-                    points = [QgsPointXY(c[0], c[1]) for c in line_coords if len(c) >= 2]
-                    if len(points) >= 2:
-                        lines.append(points)
-                if lines:
-                    return QgsGeometry.fromMultiPolylineXY(lines)
-            
-            elif geom_type == 'polygon' and resolved_coords:
-                rings = []
-                for ring_coords in resolved_coords:
-                    points = [QgsPointXY(c[0], c[1]) for c in ring_coords if len(c) >= 2]
-                    if len(points) >= 3:
-                        rings.append(points)
-                if rings:
-                    return QgsGeometry.fromPolygonXY(rings)
+            resolved_coords = GeometryParser._resolve_arcs(arc_indices, arcs, decoded_arcs)
             
-            elif geom_type == 'multipolygon' and resolved_coords:
-                # For multipolygon, arcs is [[[arc_refs], ...], ...]
-                polygons = []
-                for poly_arcs in arc_indices:
-                    poly_coords = GeometryParser._resolve_arcs(poly_arcs, arcs)
-                    rings = []
-                    for ring_coords in poly_coords:
-                        points = [QgsPointXY(c[0], c[1]) for c in ring_coords if len(c) >= 2]
-                        if len(points) >= 3:
-                            rings.append(points)
-                    if rings:
-                        polygons.append(rings)
-                if polygons:
-                    return QgsGeometry.fromMultiPolygonXY(polygons)
+            if not resolved_coords:
+                return None
+            if geom_type == 'linestring':
+                wkb = _wkb_linestring(resolved_coords[0])
+            elif geom_type == 'multilinestring':
+                wkb = _wkb_multi(
+                    _WKB_MULTILINESTRING,
+                    [_wkb_linestring(line_coords) for line_coords in resolved_coords]
+                )
+            else:
+                wkb = _wkb_polygon(resolved_coords)
+            return _geometry_from_wkb(wkb)
+        
+        elif geom_type == 'multipolygon':
+            # For multipolygon, arcs is [[[arc_refs], ...], ...]
+            polygons = [
+                _wkb_polygon(GeometryParser._resolve_arcs(poly_arcs, arcs, decoded_arcs))
+                for poly_arcs in obj.get('arcs', [])
+            ]
+            return _geometry_from_wkb(_wkb_multi(_WKB_MULTIPOLYGON, polygons))
         
         elif geom_type == 'geometrycollection':
             geometries = obj.get('geometries', [])
             geom_list = []
             for g in geometries:
-                parsed = GeometryParser._resolve_topojson_geometry(g, arcs)
+                parsed = GeometryParser._resolve_topojson_geometry(g, arcs, decoded_arcs)
                 if parsed:
                     geom_list.append(parsed)
             if geom_list:
-                combined = geom_list[0]
-                for g in geom_list[1:]:
-                    combined = combined.combine(g)
-                return combined
+                return _geometry_collection(geom_list)
         
         return None
     
     @staticmethod
-    def _resolve_arcs(arc_refs: list, arcs: list) -> list:
+    def _resolve_arcs(arc_refs: list, arcs: list, decoded_arcs: dict) -> list:
         """
         Resolve arc references to coordinate arrays.
         Arc references can be positive (forward) or negative (reverse).
@@ -636,15 +853,11 @@ class GeometryParser:
                 if isinstance(ref, int):
                     arc_idx = ref if ref >= 0 else ~ref
                     if 0 <= arc_idx < len(arcs):
-                        arc_coords = arcs[arc_idx][:]
-                        # Decode delta-encoded coordinates
-                        decoded = []
-                        x, y = 0, 0
-                        for point in arc_coords:
-                            if len(point) >= 2:
-                                x += point[0]
-                                y += point[1]
-                                decoded.append([x, y])
+                        # Decode delta-encoded coordinates once per arc
+                        decoded = decoded_arcs.get(arc_idx)
+                        if decoded is None:
+                            decoded = _decode_arc(arcs[arc_idx])
+                            decoded_arcs[arc_idx] = decoded
                         
                         if ref < 0:
                             decoded = decoded[::-1]
@@ -672,6 +885,30 @@ class GeometryParser:
         except (ValueError, TypeError):
             return None
     
+    @staticmethod
+    def parse_xy_batch(xs: Sequence, ys: Sequence) -> List[Optional[QgsGeometry]]:
+        """
+        Parse X and Y coordinate columns into Point geometries.
+        
+        Each pair is packed straight into WKB, avoiding a QgsPointXY per row.
+        
+        :param xs: X values (numbers or numeric strings)
+        :param ys: Y values, same length as xs
+        :return: List of QgsGeometry, with None where a pair is not numeric
+        """
+        pack = _POINT_WKB.pack
+        geoms = []
+        for x, y in zip(xs, ys):
+            try:
+                wkb = pack(1, _WKB_POINT, float(x), float(y))
+            except (ValueError, TypeError):
+                geoms.append(None)
+                continue
+            geom = QgsGeometry()
+            geom.fromWkb(wkb)
+            geoms.append(geom)
+        return geoms
+    
     @staticmethod
     def get_geometry_type_from_sample(samples: List[str], format_type: str) -> int:
         """
@@ -681,13 +918,30 @@ class GeometryParser:
         :param format_type: The geometry format
         :return: QgsWkbTypes geometry type
         """
+        type_cache = GeometryParser._type_cache
+        
         for sample in samples:
             if not sample:
                 continue
             
+            key = (format_type, sample)
+            geom_type = type_cache.get(key)
+            if geom_type is not None:
+                return geom_type
+            
             geom = GeometryParser.parse(sample, format_type)
             if geom and not geom.isNull():
-                return geom.wkbType()
+                geom_type = geom.wkbType()
+                if len(type_cache) >= GeometryParser._TYPE_CACHE_MAX_SIZE:
+                    type_cache.clear()
+                type_cache[key] = geom_type
+                return geom_type
         
         # Default to unknown if we can't determine
         return QgsWkbTypes.Unknown
+
+
+# CSV files often repeat the same geometry literal across rows; memoize
+# the string-only entry points.
+_detect_format_cached = lru_cache(maxsize=4096)(GeometryParser._detect_format)
+_parse_cached = lru_cache(maxsize=4096)(GeometryParser._parse_value)
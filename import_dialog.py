@@ -21,27 +21,96 @@
 """
 
 import os
-import csv
+import re
 import codecs
 from typing import List, Dict, Optional, Tuple
 
-from PyQt5.QtCore import Qt, QSettings, QVariant
+from PyQt5.QtCore import (
+    Qt, QSettings, QVariant, QThread, QTimer, QSignalBlocker, pyqtSignal,
+    QAbstractTableModel, QModelIndex
+)
 from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit,
-    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog,
+    QPushButton, QTableView, QHeaderView, QFileDialog,
     QMessageBox, QGroupBox, QComboBox, QCheckBox, QProgressBar, QFrame,
     QSizePolicy, QSpacerItem, QWidget
 )
 
 from qgis.core import (
-    QgsProject, QgsVectorLayer, QgsField, QgsFeature, QgsGeometry,
-    QgsCoordinateReferenceSystem, QgsWkbTypes, QgsMessageLog, Qgis,
-    QgsCoordinateTransform, QgsVectorFileWriter
+    QgsProject, QgsVectorLayer, QgsField, QgsFeature,
+    QgsCoordinateReferenceSystem, QgsMessageLog, Qgis,
+    QgsApplication
 )
 from qgis.gui import QgsProjectionSelectionWidget, QgsFileWidget
 
+from .csv_reader import read_csv_head, count_lines, detect_encoding, sniff_delimiter
 from .geometry_parsers import GeometryParser, GeometryFormat
+from .import_task import CSVImportTask
+
+
+class _LineCountThread(QThread):
+    """Count the lines of a file off the UI thread"""
+    
+    counted = pyqtSignal(str, int)
+    
+    def __init__(self, path: str, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self._stop = False
+    
+    def stop(self):
+        """Ask the thread to finish at the next block boundary"""
+        self._stop = True
+    
+    def run(self):
+        try:
+            count = count_lines(self.path, lambda: self._stop)
+        except OSError:
+            count = -1
+        if count >= 0:
+            self.counted.emit(self.path, count)
+
+
+class _CSVPreviewModel(QAbstractTableModel):
+    """Read-only table model over the preview rows; cells are produced on demand"""
+    
+    # Longest text shown in a preview cell
+    MAX_CELL_LENGTH = 100
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = []
+        self._rows = []
+    
+    def set_rows(self, headers: List[str], rows: List[List[str]]):
+        """Replace the displayed headers and rows"""
+        self.beginResetModel()
+        self._headers = headers
+        self._rows = rows
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        col = index.column()
+        if col >= len(row):
+            return None
+        return str(row[col])[:self.MAX_CELL_LENGTH]  # Truncate long values
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return section + 1
 
 
 class CSVGeometryImportDialog(QDialog):
@@ -56,6 +125,26 @@ class CSVGeometryImportDialog(QDialog):
         'Space': ' '
     }
     
+    # Header keywords for column auto-detection, matched anywhere in the name
+    # (e.g. 'geom' also covers 'geometry' and 'the_geom', 'x' covers 'x_coord')
+    _GEOM_COL_RE = re.compile(r'geom|wkt|wkb|shape|geo_?json|coord', re.IGNORECASE)
+    _X_COL_RE = re.compile(r'lon|lng|x|easting', re.IGNORECASE)
+    _Y_COL_RE = re.compile(r'lat|y|northing', re.IGNORECASE)
+    
+    # Saved options under the CSVGeometryImport settings group, with defaults
+    SETTINGS_GROUP = 'CSVGeometryImport'
+    SETTINGS_DEFAULTS = {
+        'delimiter': 'Comma (,)',
+        'encoding': 'UTF-8',
+        'crs': 'EPSG:4326',
+        'hasHeader': True,
+        'addToMap': True,
+        'skipInvalid': True,
+    }
+    
+    # Saved options, read once per session and kept in step by save_settings
+    _SETTINGS_CACHE = {}
+    
     def __init__(self, parent=None):
         """Initialize the dialog"""
         super().__init__(parent)
@@ -63,7 +152,19 @@ class CSVGeometryImportDialog(QDialog):
         self.csv_path = None
         self.csv_headers = []
         self.csv_preview_data = []
+        self._last_headers = None
         self.detected_format = GeometryFormat.UNKNOWN
+        self._line_count = None
+        self._line_count_thread = None
+        self._parse_cache = None
+        self._import_task = None
+        self._settings = QSettings()
+        
+        # Coalesces bursts of CSV option changes into one preview reload
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(250)
+        self._reload_timer.timeout.connect(self._load_preview)
         
         self.setup_ui()
         self.load_settings()
@@ -253,10 +354,12 @@ class CSVGeometryImportDialog(QDialog):
         preview_group = QGroupBox('CSV Preview (first 10 rows)')
         preview_layout = QVBoxLayout(preview_group)
         
-        self.preview_table = QTableWidget()
+        self.preview_model = _CSVPreviewModel(self)
+        self.preview_table = QTableView()
+        self.preview_table.setModel(self.preview_model)
         self.preview_table.setAlternatingRowColors(True)
-        self.preview_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.preview_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.preview_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.preview_table.setSelectionBehavior(QTableView.SelectRows)
         self.preview_table.setMinimumHeight(150)
         self.preview_table.horizontalHeader().setStretchLastSection(True)
         preview_layout.addWidget(self.preview_table)
@@ -316,7 +419,7 @@ class CSVGeometryImportDialog(QDialog):
     
     def browse_file(self):
         """Open file browser to select CSV file"""
-        settings = QSettings()
+        settings = self._settings
         last_dir = settings.value('CSVGeometryImport/lastDirectory', '')
         
         file_path, _ = QFileDialog.getOpenFileName(
@@ -340,13 +443,59 @@ class CSVGeometryImportDialog(QDialog):
             output_path = os.path.join(os.path.dirname(file_path), f'{base_name}.gpkg')
             self.output_file_widget.setFilePath(output_path)
             
+            # Pre-select the encoding detected from the start of the file
+            self.select_detected_encoding()
+            
+            # Pre-select the delimiter sniffed from the start of the file
+            self.select_sniffed_delimiter()
+            
             # Load and preview CSV
             self.load_csv()
     
+    def select_detected_encoding(self):
+        """Select the encoding detected for the current file, if listed"""
+        try:
+            detected = detect_encoding(self.csv_path)
+            if not detected:
+                return
+            detected = codecs.lookup(detected).name
+        except (OSError, LookupError):
+            return
+        
+        for index in range(self.encoding_combo.count()):
+            try:
+                name = codecs.lookup(self.encoding_combo.itemText(index)).name
+            except LookupError:
+                continue
+            if name == detected:
+                # load_csv follows, so skip on_csv_options_changed
+                self.encoding_combo.blockSignals(True)
+                self.encoding_combo.setCurrentIndex(index)
+                self.encoding_combo.blockSignals(False)
+                return
+    
+    def select_sniffed_delimiter(self):
+        """Select the delimiter sniffed from the current file, if listed"""
+        try:
+            delimiter = sniff_delimiter(self.csv_path, self.get_selected_encoding())
+        except (OSError, LookupError):
+            return
+        
+        for name, value in self.DELIMITER_OPTIONS.items():
+            if value == delimiter:
+                # load_csv follows, so skip on_csv_options_changed
+                self.delimiter_combo.blockSignals(True)
+                self.delimiter_combo.setCurrentText(name)
+                self.delimiter_combo.blockSignals(False)
+                return
+    
     def on_csv_options_changed(self):
         """Handle changes to CSV parsing options"""
+        self._parse_cache = None
         if self.csv_path:
-            self.load_csv()
+            # Headers and columns are stale until the pending reload runs
+            self.import_btn.setEnabled(False)
+            self._reload_timer.start()
     
     def reload_csv(self):
         """Reload the CSV file with current options"""
@@ -367,46 +516,52 @@ class CSVGeometryImportDialog(QDialog):
         if not self.csv_path or not os.path.exists(self.csv_path):
             return
         
+        self._parse_cache = None
+        self._last_headers = None
+        self._reload_timer.stop()
+        self._load_preview()
+        self._count_rows_async()
+    
+    def _load_preview(self):
+        """Read the header and the first 10 data rows for the preview"""
+        if not self.csv_path or not os.path.exists(self.csv_path):
+            return
+        
         try:
             delimiter = self.get_selected_delimiter()
             encoding = self.get_selected_encoding()
             has_header = self.has_header_check.isChecked()
             
-            with codecs.open(self.csv_path, 'r', encoding=encoding, errors='replace') as f:
-                # Use csv.Sniffer to detect if needed
-                reader = csv.reader(f, delimiter=delimiter)
-                
-                rows = list(reader)
-                
-                if not rows:
-                    QMessageBox.warning(self, 'Warning', 'The CSV file is empty.')
-                    return
-                
-                # Get headers
-                if has_header:
-                    self.csv_headers = rows[0]
-                    data_rows = rows[1:]
-                else:
-                    # Generate column names
-                    self.csv_headers = [f'Column_{i+1}' for i in range(len(rows[0]))]
-                    data_rows = rows
-                
-                # Store preview data (first 10 rows)
-                self.csv_preview_data = data_rows[:10]
-                total_rows = len(data_rows)
-                
-                # Update row count label
-                self.row_count_label.setText(f'Total rows: {total_rows:,}')
-                
-                # Update preview table
-                self.update_preview_table()
-                
-                # Update column dropdowns
-                self.update_column_combos()
-                
-                # Enable import button
-                self.import_btn.setEnabled(True)
-                
+            rows = read_csv_head(self.csv_path, delimiter, encoding, max_rows=11)
+            
+            if not rows:
+                QMessageBox.warning(self, 'Warning', 'The CSV file is empty.')
+                return
+            
+            # Get headers
+            if has_header:
+                self.csv_headers = rows[0]
+                data_rows = rows[1:]
+            else:
+                # Generate column names
+                self.csv_headers = [f'Column_{i+1}' for i in range(len(rows[0]))]
+                data_rows = rows
+            
+            # Store preview data (first 10 rows)
+            self.csv_preview_data = data_rows[:10]
+            
+            # Update row count label
+            self._update_row_count_label()
+            
+            # Update preview table
+            self.update_preview_table()
+            
+            # Update column dropdowns
+            self.update_column_combos()
+            
+            # Enable import button
+            self.import_btn.setEnabled(True)
+            
         except Exception as e:
             QMessageBox.critical(
                 self, 'Error',
@@ -417,69 +572,156 @@ class CSVGeometryImportDialog(QDialog):
                 'CSV Geometry Import', Qgis.Critical
             )
     
+    def _count_rows_async(self):
+        """Count the lines of the current file in a background thread"""
+        self._stop_row_count()
+        self._line_count = None
+        self._update_row_count_label()
+        
+        thread = _LineCountThread(self.csv_path, self)
+        thread.counted.connect(self._on_rows_counted)
+        thread.finished.connect(lambda: self._release_row_count(thread))
+        self._line_count_thread = thread
+        thread.start()
+    
+    def _release_row_count(self, thread: _LineCountThread):
+        """Delete a finished line count thread so the dialog does not collect them"""
+        if self._line_count_thread is thread:
+            self._line_count_thread = None
+        thread.deleteLater()
+    
+    def _stop_row_count(self):
+        """Stop a running line count, if any"""
+        if self._line_count_thread is not None:
+            self._line_count_thread.counted.disconnect(self._on_rows_counted)
+            self._line_count_thread.stop()
+            self._line_count_thread.wait()
+            self._line_count_thread = None
+    
+    def _on_rows_counted(self, path: str, count: int):
+        """Store the line count of the current file"""
+        if path != self.csv_path:
+            return
+        self._line_count = count
+        self._update_row_count_label()
+    
+    def _update_row_count_label(self):
+        """Show the data row count, excluding the header line"""
+        if self._line_count is None:
+            self.row_count_label.setText('Total rows: counting...')
+            return
+        total_rows = self._line_count
+        if self.has_header_check.isChecked():
+            total_rows = max(total_rows - 1, 0)
+        self.row_count_label.setText(f'Total rows: {total_rows:,}')
+    
+    def done(self, result):
+        """Stop background work before the dialog closes"""
+        self._stop_row_count()
+        if self._import_task is not None:
+            self._import_task.cancel()
+        super().done(result)
+    
+    def reset(self):
+        """Forget the previous file and reload the saved options for a new run"""
+        self._reload_timer.stop()
+        self._stop_row_count()
+        
+        self.csv_path = None
+        self.csv_headers = []
+        self.csv_preview_data = []
+        self._last_headers = None
+        self._line_count = None
+        self._parse_cache = None
+        self.detected_format = GeometryFormat.UNKNOWN
+        
+        self.file_path_edit.clear()
+        self.layer_name_edit.clear()
+        self.format_combo.setCurrentIndex(0)  # Auto-detect
+        self.temp_layer_check.setChecked(False)
+        self.detailed_report_check.setChecked(False)
+        self.output_file_widget.setFilePath('')
+        self.detected_format_label.setText('')
+        self.row_count_label.setText('')
+        self.reload_btn.setEnabled(False)
+        self.import_btn.setEnabled(False)
+        self.progress_bar.setVisible(False)
+        
+        combos = (self.geom_column_combo, self.x_column_combo, self.y_column_combo)
+        blockers = [QSignalBlocker(combo) for combo in combos]
+        try:
+            for combo in combos:
+                combo.clear()
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
+        self.update_preview_table()
+        
+        self.load_settings()
+    
     def update_preview_table(self):
         """Update the preview table with CSV data"""
-        self.preview_table.clear()
-        
         if not self.csv_headers:
+            self.preview_model.set_rows([], [])
             return
         
-        # Set up table
-        self.preview_table.setColumnCount(len(self.csv_headers))
-        self.preview_table.setHorizontalHeaderLabels(self.csv_headers)
-        self.preview_table.setRowCount(len(self.csv_preview_data))
-        
-        # Populate data
-        for row_idx, row in enumerate(self.csv_preview_data):
-            for col_idx, value in enumerate(row):
-                if col_idx < len(self.csv_headers):
-                    item = QTableWidgetItem(str(value)[:100])  # Truncate long values
-                    self.preview_table.setItem(row_idx, col_idx, item)
-        
-        # Resize columns to content
-        self.preview_table.resizeColumnsToContents()
+        # Reset the model and size the columns with a single repaint
+        self.preview_table.setUpdatesEnabled(False)
+        try:
+            self.preview_model.set_rows(self.csv_headers, self.csv_preview_data)
+            
+            # Resize columns to content
+            self.preview_table.resizeColumnsToContents()
+        finally:
+            self.preview_table.setUpdatesEnabled(True)
     
     def update_column_combos(self):
         """Update column selection dropdowns"""
+        # Same headers as the last update: keep the current selections, but
+        # the preview data may have changed (e.g. another encoding)
+        if self.csv_headers == self._last_headers:
+            self.on_geom_column_changed()
+            return
+        self._last_headers = list(self.csv_headers)
+        
         # Store current selections
         current_geom = self.geom_column_combo.currentText()
         current_x = self.x_column_combo.currentText()
         current_y = self.y_column_combo.currentText()
         
-        # Clear and populate
-        self.geom_column_combo.clear()
-        self.x_column_combo.clear()
-        self.y_column_combo.clear()
-        
-        self.geom_column_combo.addItems(self.csv_headers)
-        self.x_column_combo.addItems(self.csv_headers)
-        self.y_column_combo.addItems(self.csv_headers)
-        
-        # Try to restore selections or auto-detect
-        if current_geom and current_geom in self.csv_headers:
-            self.geom_column_combo.setCurrentText(current_geom)
-        else:
-            self.auto_detect_geometry_column()
-        
-        if current_x and current_x in self.csv_headers:
-            self.x_column_combo.setCurrentText(current_x)
-        else:
-            self.auto_detect_xy_columns()
+        # Repopulate silently; format detection runs once at the end
+        combos = (self.geom_column_combo, self.x_column_combo, self.y_column_combo)
+        blockers = [QSignalBlocker(combo) for combo in combos]
+        try:
+            # Clear and populate
+            for combo in combos:
+                combo.clear()
+                combo.addItems(self.csv_headers)
+            
+            # Try to restore selections or auto-detect
+            if current_geom and current_geom in self.csv_headers:
+                self.geom_column_combo.setCurrentText(current_geom)
+            else:
+                self.auto_detect_geometry_column()
+            
+            if current_x and current_x in self.csv_headers:
+                self.x_column_combo.setCurrentText(current_x)
+            else:
+                self.auto_detect_xy_columns()
+            
+            if current_y and current_y in self.csv_headers:
+                self.y_column_combo.setCurrentText(current_y)
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
         
-        if current_y and current_y in self.csv_headers:
-            self.y_column_combo.setCurrentText(current_y)
+        self.on_geom_column_changed()
     
     def auto_detect_geometry_column(self):
         """Try to auto-detect the geometry column"""
-        geometry_keywords = [
-            'geometry', 'geom', 'wkt', 'wkb', 'shape', 'the_geom',
-            'geojson', 'geo_json', 'coordinates', 'coord'
-        ]
-        
         for col in self.csv_headers:
-            if col.lower() in geometry_keywords or any(kw in col.lower() for kw in geometry_keywords):
+            if self._GEOM_COL_RE.search(col):
                 self.geom_column_combo.setCurrentText(col)
-                self.detect_geometry_format()
                 return
         
         # If no geometry column found, try to detect from content
@@ -496,14 +738,10 @@ class CSVGeometryImportDialog(QDialog):
     
     def auto_detect_xy_columns(self):
         """Try to auto-detect X and Y columns"""
-        x_keywords = ['lon', 'longitude', 'lng', 'x', 'long', 'x_coord', 'xcoord', 'easting']
-        y_keywords = ['lat', 'latitude', 'y', 'y_coord', 'ycoord', 'northing']
-        
         for col in self.csv_headers:
-            col_lower = col.lower()
-            if any(kw == col_lower or kw in col_lower for kw in x_keywords):
+            if self._X_COL_RE.search(col):
                 self.x_column_combo.setCurrentText(col)
-            if any(kw == col_lower or kw in col_lower for kw in y_keywords):
+            if self._Y_COL_RE.search(col):
                 self.y_column_combo.setCurrentText(col)
     
     def on_format_changed(self):
@@ -583,21 +821,28 @@ class CSVGeometryImportDialog(QDialog):
             return
         
         try:
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(0)
-            self.import_btn.setEnabled(False)
-            
             # Get options
             delimiter = self.get_selected_delimiter()
             encoding = self.get_selected_encoding()
             has_header = self.has_header_check.isChecked()
             skip_invalid = self.skip_invalid_check.isChecked()
-            detailed_report = self.detailed_report_check.isChecked()
             is_temp_layer = self.temp_layer_check.isChecked()
             output_path = self.output_file_widget.filePath()
             layer_name = self.layer_name_edit.text() or os.path.splitext(
                 os.path.basename(self.csv_path)
             )[0]
+            x_col = self.x_column_combo.currentText()
+            y_col = self.y_column_combo.currentText()
+            geom_col = self.geom_column_combo.currentText()
+            
+            # Validate columns against the previewed headers
+            if format_type == GeometryFormat.XY:
+                if x_col not in self.csv_headers or y_col not in self.csv_headers:
+                    QMessageBox.warning(self, 'Warning', 'Please select valid X and Y columns.')
+                    return
+            elif geom_col not in self.csv_headers:
+                QMessageBox.warning(self, 'Warning', 'Please select a valid geometry column.')
+                return
             
             # Validate output path for non-temp layers
             if not is_temp_layer:
@@ -614,208 +859,67 @@ class CSVGeometryImportDialog(QDialog):
             if not crs.isValid():
                 crs = QgsCoordinateReferenceSystem('EPSG:4326')
             
-            # Read all data
-            with codecs.open(self.csv_path, 'r', encoding=encoding, errors='replace') as f:
-                reader = csv.reader(f, delimiter=delimiter)
-                rows = list(reader)
+            # Reuse the rows of a previous import of the same file
+            cache_key = (self.csv_path, os.path.getmtime(self.csv_path), delimiter, encoding)
+            rows = None
+            if self._parse_cache is not None and self._parse_cache[0] == cache_key:
+                rows = self._parse_cache[1]
             
-            if not rows:
-                QMessageBox.warning(self, 'Warning', 'The CSV file is empty.')
-                return
+            task = CSVImportTask(
+                self.csv_path, delimiter, encoding, has_header,
+                format_type, geom_col, x_col, y_col,
+                skip_invalid, crs, layer_name,
+                output_path=None if is_temp_layer else output_path,
+                transform_context=QgsProject.instance().transformContext(),
+                rows=rows
+            )
+            task.progressChanged.connect(lambda progress: self.progress_bar.setValue(int(progress)))
+            task.taskCompleted.connect(lambda: self._on_import_finished(task, cache_key, True))
+            task.taskTerminated.connect(lambda: self._on_import_finished(task, cache_key, False))
             
-            # Get headers and data
-            if has_header:
-                headers = rows[0]
-                data_rows = rows[1:]
-            else:
-                headers = [f'Column_{i+1}' for i in range(len(rows[0]))]
-                data_rows = rows
+            self.progress_bar.setMaximum(100)
+            self.progress_bar.setValue(0)
+            self.progress_bar.setVisible(True)
+            self.import_btn.setEnabled(False)
             
-            total_rows = len(data_rows)
-            self.progress_bar.setMaximum(total_rows)
+            self._import_task = task
+            QgsApplication.taskManager().addTask(task)
             
-            # Determine geometry column index
-            if format_type == GeometryFormat.XY:
-                x_col = self.x_column_combo.currentText()
-                y_col = self.y_column_combo.currentText()
-                x_idx = headers.index(x_col) if x_col in headers else -1
-                y_idx = headers.index(y_col) if y_col in headers else -1
-                
-                if x_idx < 0 or y_idx < 0:
-                    QMessageBox.warning(self, 'Warning', 'Please select valid X and Y columns.')
-                    return
-                
-                geom_col_idx = -1
-                attribute_headers = [h for i, h in enumerate(headers) if i not in (x_idx, y_idx)]
-            else:
-                geom_col = self.geom_column_combo.currentText()
-                if geom_col not in headers:
-                    QMessageBox.warning(self, 'Warning', 'Please select a valid geometry column.')
-                    return
-                
-                geom_col_idx = headers.index(geom_col)
-                x_idx = y_idx = -1
-                attribute_headers = [h for i, h in enumerate(headers) if i != geom_col_idx]
-            
-            # Determine geometry type from first valid geometry
-            geom_type = QgsWkbTypes.Unknown
-            for row in data_rows[:100]:  # Check first 100 rows
-                if format_type == GeometryFormat.XY:
-                    geom_type = QgsWkbTypes.Point
-                    break
-                else:
-                    if geom_col_idx < len(row) and row[geom_col_idx]:
-                        geom = GeometryParser.parse(row[geom_col_idx], format_type)
-                        if geom and not geom.isNull():
-                            geom_type = geom.wkbType()
-                            break
-            
-            # Create memory layer
-            geom_type_str = QgsWkbTypes.displayString(geom_type) if geom_type != QgsWkbTypes.Unknown else 'Point'
-            layer = QgsVectorLayer(
-                f'{geom_type_str}?crs={crs.authid()}',
-                layer_name,
-                'memory'
+        except Exception as e:
+            QMessageBox.critical(
+                self, 'Error',
+                f'Failed to import CSV:\n{str(e)}'
             )
-            
-            if not layer.isValid():
-                QMessageBox.critical(self, 'Error', 'Failed to create memory layer.')
+            QgsMessageLog.logMessage(
+                f"Import error: {str(e)}",
+                'CSV Geometry Import', Qgis.Critical
+            )
+    
+    def _on_import_finished(self, task, cache_key, succeeded: bool):
+        """Add the imported layer and report the result of an import task"""
+        self._import_task = None
+        # Keep the rows for a retry only; a finished import drops them
+        if not succeeded and task.rows:
+            self._parse_cache = (cache_key, task.rows)
+        else:
+            self._parse_cache = None
+        
+        try:
+            if not succeeded:
+                if task.error:
+                    QMessageBox.critical(self, 'Error', task.error)
                 return
             
-            provider = layer.dataProvider()
-            
-            # Add attribute fields
-            fields = [QgsField(name, QVariant.String) for name in attribute_headers]
-            provider.addAttributes(fields)
-            layer.updateFields()
-            
-            # Prepare for tracking null and invalid geometries
-            features = []
-            null_geom_rows = []  # Rows with null/empty geometry values
-            invalid_geom_rows = []  # Rows with invalid geometry (parsing failed)
-            
-            for row_idx, row in enumerate(data_rows):
-                if row_idx % 100 == 0:
-                    self.progress_bar.setValue(row_idx)
-                    QCoreApplication.processEvents()
-                
-                # Parse geometry
-                geom = None
-                geom_value = ''
-                is_null = False
-                is_invalid = False
-                
-                if format_type == GeometryFormat.XY:
-                    try:
-                        x_val = row[x_idx] if x_idx < len(row) else ''
-                        y_val = row[y_idx] if y_idx < len(row) else ''
-                        
-                        if not x_val or not y_val:
-                            is_null = True
-                        else:
-                            x_float = float(x_val)
-                            y_float = float(y_val)
-                            geom = GeometryParser.parse('', format_type, x_value=x_float, y_value=y_float)
-                            if geom is None or geom.isNull():
-                                is_invalid = True
-                    except (ValueError, IndexError):
-                        is_invalid = True
-                else:
-                    geom_value = row[geom_col_idx] if geom_col_idx < len(row) else ''
-                    
-                    if not geom_value or geom_value.strip() == '':
-                        is_null = True
-                    else:
-                        geom = GeometryParser.parse(geom_value, format_type)
-                        if geom is None or geom.isNull():
-                            is_invalid = True
-                
-                # Build attribute list
-                attrs = []
-                for i, h in enumerate(headers):
-                    if format_type == GeometryFormat.XY:
-                        if i not in (x_idx, y_idx):
-                            attrs.append(row[i] if i < len(row) else '')
-                    else:
-                        if i != geom_col_idx:
-                            attrs.append(row[i] if i < len(row) else '')
-                
-                # Handle null/invalid geometries
-                if is_null:
-                    null_geom_rows.append((row_idx + 1, row, attrs))  # Row number (1-indexed)
-                    if skip_invalid:
-                        continue
-                    else:
-                        geom = QgsGeometry()  # Empty geometry
-                elif is_invalid:
-                    invalid_geom_rows.append((row_idx + 1, row, attrs, geom_value))
-                    if skip_invalid:
-                        continue
-                    else:
-                        geom = QgsGeometry()  # Empty geometry
-                
-                # Create feature
-                feat = QgsFeature()
-                feat.setGeometry(geom if geom else QgsGeometry())
-                feat.setAttributes(attrs)
-                features.append(feat)
-            
-            # Add all features
-            provider.addFeatures(features)
-            layer.updateExtents()
-            
-            self.progress_bar.setValue(total_rows)
+            is_temp_layer = task.output_path is None
+            detailed_report = self.detailed_report_check.isChecked()
             
             # Handle layer output based on temp/file option
-            final_layer = None
             if is_temp_layer:
                 # Use memory layer directly
-                final_layer = layer
+                final_layer = task.layer
             else:
-                # Save to file
-                # Determine driver from file extension
-                ext = os.path.splitext(output_path)[1].lower()
-                if ext == '.shp':
-                    driver_name = 'ESRI Shapefile'
-                elif ext == '.geojson':
-                    driver_name = 'GeoJSON'
-                else:
-                    driver_name = 'GPKG'
-                
-                # Remove existing file if it exists (for overwrite)
-                if os.path.exists(output_path):
-                    try:
-                        os.remove(output_path)
-                        # For shapefiles, also remove associated files
-                        if ext == '.shp':
-                            for ext2 in ['.shx', '.dbf', '.prj', '.cpg']:
-                                assoc_file = output_path[:-4] + ext2
-                                if os.path.exists(assoc_file):
-                                    os.remove(assoc_file)
-                    except Exception as e:
-                        QgsMessageLog.logMessage(
-                            f"Warning: Could not remove existing file: {e}",
-                            'CSV Geometry Import', Qgis.Warning
-                        )
-                
-                # Write to file
-                options = QgsVectorFileWriter.SaveVectorOptions()
-                options.driverName = driver_name
-                options.fileEncoding = 'UTF-8'
-                
-                error = QgsVectorFileWriter.writeAsVectorFormatV3(
-                    layer, output_path, QgsProject.instance().transformContext(), options
-                )
-                
-                if error[0] != QgsVectorFileWriter.NoError:
-                    QMessageBox.critical(
-                        self, 'Error',
-                        f'Failed to save layer to file:\\n{error[1]}'
-                    )
-                    return
-                
                 # Load the saved file as a layer
-                final_layer = QgsVectorLayer(output_path, layer_name, 'ogr')
+                final_layer = QgsVectorLayer(task.output_path, task.layer_name, 'ogr')
                 if not final_layer.isValid():
                     QMessageBox.critical(self, 'Error', 'Failed to load saved layer.')
                     return
@@ -824,23 +928,26 @@ class CSVGeometryImportDialog(QDialog):
             if self.add_to_map_check.isChecked():
                 QgsProject.instance().addMapLayer(final_layer)
             
+            null_geom_rows = task.null_geom_rows
+            invalid_geom_rows = task.invalid_geom_rows
+            
             # Create detailed report layers if requested
             if detailed_report:
                 self._create_report_layers(
-                    layer_name, headers, attribute_headers, 
-                    null_geom_rows, invalid_geom_rows, 
-                    geom_col_idx, x_idx, y_idx, format_type
+                    task.layer_name, task.headers, task.attribute_headers,
+                    null_geom_rows, invalid_geom_rows,
+                    task.geom_col_idx, task.x_idx, task.y_idx, task.format_type
                 )
             
             # Build success message
             if is_temp_layer:
-                success_msg = f'Successfully imported {len(features):,} features as temporary layer.'
+                success_msg = f'Successfully imported {task.imported_count:,} features as temporary layer.'
             else:
-                success_msg = f'Successfully imported {len(features):,} features.'
-                success_msg += f'\n\nSaved to: {output_path}'
+                success_msg = f'Successfully imported {task.imported_count:,} features.'
+                success_msg += f'\n\nSaved to: {task.output_path}'
             
-            null_count = len(null_geom_rows)
-            invalid_count = len(invalid_geom_rows)
+            null_count = task.null_count
+            invalid_count = task.invalid_count
             
             if null_count > 0 or invalid_count > 0:
                 success_msg += '\n\nGeometry Issues:'
@@ -849,7 +956,7 @@ class CSVGeometryImportDialog(QDialog):
                 if invalid_count > 0:
                     success_msg += f'\n• {invalid_count:,} rows had invalid geometry'
                 
-                if skip_invalid:
+                if task.skip_invalid:
                     success_msg += '\n\n(These rows were skipped)'
                 else:
                     success_msg += '\n\n(Imported with empty geometry)'
@@ -943,48 +1050,59 @@ class CSVGeometryImportDialog(QDialog):
                 provider.addFeatures(features)
                 QgsProject.instance().addMapLayer(invalid_layer)
     
+    def _cached_settings(self) -> Dict:
+        """Saved options, read from QSettings on first use"""
+        cache = CSVGeometryImportDialog._SETTINGS_CACHE
+        if not cache:
+            settings = self._settings
+            settings.beginGroup(self.SETTINGS_GROUP)
+            for key, default in self.SETTINGS_DEFAULTS.items():
+                cache[key] = settings.value(key, default, type=type(default))
+            settings.endGroup()
+        return cache
+    
     def load_settings(self):
         """Load saved settings"""
-        settings = QSettings()
+        values = self._cached_settings()
         
         # Delimiter
-        delimiter = settings.value('CSVGeometryImport/delimiter', 'Comma (,)')
-        idx = self.delimiter_combo.findText(delimiter)
+        idx = self.delimiter_combo.findText(values['delimiter'])
         if idx >= 0:
             self.delimiter_combo.setCurrentIndex(idx)
         
         # Encoding
-        encoding = settings.value('CSVGeometryImport/encoding', 'UTF-8')
-        idx = self.encoding_combo.findText(encoding)
+        idx = self.encoding_combo.findText(values['encoding'])
         if idx >= 0:
             self.encoding_combo.setCurrentIndex(idx)
         
         # CRS
-        crs_auth = settings.value('CSVGeometryImport/crs', 'EPSG:4326')
-        self.crs_selector.setCrs(QgsCoordinateReferenceSystem(crs_auth))
+        self.crs_selector.setCrs(QgsCoordinateReferenceSystem(values['crs']))
         
         # Options
-        self.has_header_check.setChecked(
-            settings.value('CSVGeometryImport/hasHeader', True, type=bool)
-        )
-        self.add_to_map_check.setChecked(
-            settings.value('CSVGeometryImport/addToMap', True, type=bool)
-        )
-        self.skip_invalid_check.setChecked(
-            settings.value('CSVGeometryImport/skipInvalid', True, type=bool)
-        )
+        self.has_header_check.setChecked(values['hasHeader'])
+        self.add_to_map_check.setChecked(values['addToMap'])
+        self.skip_invalid_check.setChecked(values['skipInvalid'])
     
     def save_settings(self):
         """Save current settings"""
-        settings = QSettings()
-        
-        settings.setValue('CSVGeometryImport/delimiter', self.delimiter_combo.currentText())
-        settings.setValue('CSVGeometryImport/encoding', self.encoding_combo.currentText())
-        settings.setValue('CSVGeometryImport/crs', self.crs_selector.crs().authid())
-        settings.setValue('CSVGeometryImport/hasHeader', self.has_header_check.isChecked())
-        settings.setValue('CSVGeometryImport/addToMap', self.add_to_map_check.isChecked())
-        settings.setValue('CSVGeometryImport/skipInvalid', self.skip_invalid_check.isChecked())
-
-
-# Import QCoreApplication for processEvents
-from PyQt5.QtCore import QCoreApplication
+        values = {
+            'delimiter': self.delimiter_combo.currentText(),
+            'encoding': self.encoding_combo.currentText(),
+            'crs': self.crs_selector.crs().authid(),
+            'hasHeader': self.has_header_check.isChecked(),
+            'addToMap': self.add_to_map_check.isChecked(),
+            'skipInvalid': self.skip_invalid_check.isChecked(),
+        }
+        
+        # Only write options that changed since they were last read or saved
+        cache = self._cached_settings()
+        changed = {key: value for key, value in values.items() if cache.get(key) != value}
+        if not changed:
+            return
+        
+        settings = self._settings
+        settings.beginGroup(self.SETTINGS_GROUP)
+        for key, value in changed.items():
+            settings.setValue(key, value)
+            cache[key] = value
+        settings.endGroup()
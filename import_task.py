@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ CSV Import Task
+                                 A QGIS plugin module
+ Background task that reads a CSV file and builds the imported layer
+                              -------------------
+        begin                : 2025-12-21
+        copyright            : (C) 2025 by Mirjan Ali Sha
+        email                : mastools.help@gmail.com
+ ***************************************************************************/
+"""
+
+import os
+from operator import itemgetter
+from typing import Callable, List, Optional, Tuple
+
+from PyQt5.QtCore import QCoreApplication, QVariant
+
+from qgis.core import (
+    QgsTask, QgsVectorLayer, QgsField, QgsFeature, QgsGeometry,
+    QgsWkbTypes, QgsMessageLog, Qgis, QgsVectorFileWriter, QgsFeatureSink,
+    QgsCoordinateReferenceSystem, QgsCoordinateTransformContext
+)
+
+from .csv_reader import read_csv_rows, infer_column_type
+from .geometry_parsers import GeometryParser, GeometryFormat
+
+
+# Field type for each type returned by infer_column_type()
+_FIELD_TYPES = {int: QVariant.LongLong, float: QVariant.Double, str: QVariant.String}
+
+
+def _attribute_getter(indices: List[int]) -> Callable[[List[str]], tuple]:
+    """
+    Return a function gathering the values at indices of a row in one call.
+
+    itemgetter returns a bare value rather than a tuple for a single index,
+    so that case and the empty one get their own function.
+    """
+    if len(indices) > 1:
+        return itemgetter(*indices)
+    if indices:
+        index = indices[0]
+
+        def get_attrs(row):
+            return (row[index],)
+    else:
+        def get_attrs(row):
+            return ()
+    return get_attrs
+
+
+def _row_attributes(row: List[str], get_attrs: Callable[[List[str]], tuple],
+                    numeric_columns: List[Tuple[int, type]]) -> list:
+    """Attribute list of a row; numeric values are converted, empty ones become NULL"""
+    attrs = list(get_attrs(row))
+    for pos, col_type in numeric_columns:
+        value = attrs[pos]
+        attrs[pos] = col_type(value) if value else None
+    return attrs
+
+
+class CSVImportTask(QgsTask):
+    """
+    Read a CSV file and build a layer from it off the GUI thread.
+
+    After the task completes, the results are available as attributes:
+    rows, headers, attribute_headers, geom_col_idx, x_idx, y_idx, layer,
+    imported_count, null_count, invalid_count, null_geom_rows and
+    invalid_geom_rows. When the task fails, error holds the message to
+    show (None if it was canceled).
+    """
+
+    # Features per addFeatures() call
+    FEATURE_BATCH_SIZE = 10000
+
+    # Rows between progress updates and cancellation checks
+    PROGRESS_INTERVAL = 1000
+
+    def __init__(self, csv_path: str, delimiter: str, encoding: str, has_header: bool,
+                 format_type: str, geom_col: str, x_col: str, y_col: str,
+                 skip_invalid: bool, crs: QgsCoordinateReferenceSystem, layer_name: str,
+                 output_path: Optional[str] = None,
+                 transform_context: Optional[QgsCoordinateTransformContext] = None,
+                 rows: Optional[List[List[str]]] = None):
+        """
+        :param geom_col: Geometry column name (ignored for X-Y format)
+        :param x_col: X column name (X-Y format only)
+        :param y_col: Y column name (X-Y format only)
+        :param output_path: File to save the layer to; None keeps it in memory
+        :param transform_context: Transform context used when saving to file
+        :param rows: Already parsed rows of the file, read again if None
+        """
+        super().__init__('Import CSV with Geometry', QgsTask.CanCancel)
+
+        self.csv_path = csv_path
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.has_header = has_header
+        self.format_type = format_type
+        self.geom_col = geom_col
+        self.x_col = x_col
+        self.y_col = y_col
+        self.skip_invalid = skip_invalid
+        self.crs = crs
+        self.layer_name = layer_name
+        self.output_path = output_path
+        self.transform_context = transform_context
+        self.rows = rows
+
+        self.headers = []
+        self.attribute_headers = []
+        self.geom_col_idx = self.x_idx = self.y_idx = -1
+        self.layer = None
+        self.imported_count = 0
+        self.null_count = 0
+        self.invalid_count = 0
+        self.null_geom_rows = []  # Rows with null/empty geometry values
+        self.invalid_geom_rows = []  # Rows with invalid geometry (parsing failed)
+        self.error = None
+
+    def run(self) -> bool:
+        """Read the file and build the layer"""
+        try:
+            return self._import()
+        except Exception as e:
+            self.error = f'Failed to import CSV:\n{str(e)}'
+            QgsMessageLog.logMessage(
+                f"Import error: {str(e)}",
+                'CSV Geometry Import', Qgis.Critical
+            )
+            return False
+        finally:
+            GeometryParser.clear_caches()
+
+    def _import(self) -> bool:
+        """Body of run(); returns False with error set on failure"""
+        format_type = self.format_type
+
+        # Read all data
+        if self.rows is None:
+            self.rows = read_csv_rows(self.csv_path, self.delimiter, self.encoding)
+        rows = self.rows
+
+        if not rows:
+            self.error = 'The CSV file is empty.'
+            return False
+
+        # Get headers and data
+        if self.has_header:
+            headers = rows[0]
+            data_rows = rows[1:]
+        else:
+            headers = [f'Column_{i+1}' for i in range(len(rows[0]))]
+            data_rows = rows
+        self.headers = headers
+
+        # Pad short rows once so the loops below can index every column
+        width = len(headers)
+        pad = [''] * width
+        data_rows = [row if len(row) >= width else row + pad[len(row):] for row in data_rows]
+
+        total_rows = len(data_rows)
+
+        # Determine geometry column index
+        if format_type == GeometryFormat.XY:
+            x_idx = headers.index(self.x_col) if self.x_col in headers else -1
+            y_idx = headers.index(self.y_col) if self.y_col in headers else -1
+
+            if x_idx < 0 or y_idx < 0:
+                self.error = 'Please select valid X and Y columns.'
+                return False
+
+            geom_col_idx = -1
+            attribute_indices = [i for i in range(len(headers)) if i not in (x_idx, y_idx)]
+        else:
+            if self.geom_col not in headers:
+                self.error = 'Please select a valid geometry column.'
+                return False
+
+            geom_col_idx = headers.index(self.geom_col)
+            x_idx = y_idx = -1
+            attribute_indices = [i for i in range(len(headers)) if i != geom_col_idx]
+        attribute_headers = [headers[i] for i in attribute_indices]
+        self.geom_col_idx, self.x_idx, self.y_idx = geom_col_idx, x_idx, y_idx
+        self.attribute_headers = attribute_headers
+
+        # Type each attribute column from its values
+        attribute_types = [
+            infer_column_type(row[i] for row in data_rows)
+            for i in attribute_indices
+        ]
+
+        # Determine geometry type from first valid geometry
+        if format_type == GeometryFormat.XY:
+            geom_type = QgsWkbTypes.Point
+        else:
+            # Check first 100 rows
+            geom_type = GeometryParser.get_geometry_type_from_sample(
+                [row[geom_col_idx] for row in data_rows[:100]],
+                format_type
+            )
+
+        # Create memory layer; the CRS object is assigned as is rather than
+        # resolved again from an authid in the URI (custom CRSs have none)
+        geom_type_str = QgsWkbTypes.displayString(geom_type) if geom_type != QgsWkbTypes.Unknown else 'Point'
+        layer = QgsVectorLayer(geom_type_str, self.layer_name, 'memory')
+
+        if not layer.isValid():
+            self.error = 'Failed to create memory layer.'
+            return False
+        layer.setCrs(self.crs)
+
+        provider = layer.dataProvider()
+
+        # Add attribute fields
+        fields = [
+            QgsField(name, _FIELD_TYPES[col_type])
+            for name, col_type in zip(attribute_headers, attribute_types)
+        ]
+        provider.addAttributes(fields)
+        layer.updateFields()
+
+        # Features are added in batches to bound peak memory
+        batch = []
+        imported_count = 0
+        skip_invalid = self.skip_invalid
+
+        # Features are copied from a template that carries the layer fields
+        template = QgsFeature(layer.fields())
+
+        # Local names for the per-row loops
+        Feature = QgsFeature
+        Geometry = QgsGeometry
+        add_features = provider.addFeatures
+        fast_insert = QgsFeatureSink.FastInsert
+        add_feature = batch.append
+        add_null_row = self.null_geom_rows.append
+        add_invalid_row = self.invalid_geom_rows.append
+        is_canceled = self.isCanceled
+        set_progress = self.setProgress
+        progress_interval = self.PROGRESS_INTERVAL
+        batch_size = self.FEATURE_BATCH_SIZE
+        numeric_columns = [
+            (pos, col_type) for pos, col_type in enumerate(attribute_types) if col_type is not str
+        ]
+
+        get_attrs = _attribute_getter(attribute_indices)
+        row_attributes = _row_attributes
+
+        if format_type == GeometryFormat.XY:
+            # Parse all points in one pass over the X and Y columns
+            x_values = [row[x_idx] for row in data_rows]
+            y_values = [row[y_idx] for row in data_rows]
+            xy_geoms = GeometryParser.parse_xy_batch(x_values, y_values)
+
+            for row_idx, row in enumerate(data_rows):
+                if row_idx % progress_interval == 0:
+                    if is_canceled():
+                        return False
+                    set_progress(row_idx * 100 / total_rows)
+
+                attrs = row_attributes(row, get_attrs, numeric_columns)
+
+                # Handle null/invalid geometries
+                geom = xy_geoms[row_idx]
+                if not x_values[row_idx] or not y_values[row_idx]:
+                    add_null_row((row_idx + 1, row, attrs))  # Row number (1-indexed)
+                    if skip_invalid:
+                        continue
+                    geom = Geometry()  # Empty geometry
+                elif geom is None:
+                    add_invalid_row((row_idx + 1, row, attrs, ''))
+                    if skip_invalid:
+                        continue
+                    geom = Geometry()  # Empty geometry
+
+                # Create feature
+                feat = Feature(template)
+                feat.setGeometry(geom)
+                feat.setAttributes(attrs)
+                add_feature(feat)
+
+                if len(batch) >= batch_size:
+                    add_features(batch, fast_insert)
+                    imported_count += len(batch)
+                    batch.clear()
+        else:
+            parse_batch = GeometryParser.parse_batch
+            parsed = {}  # Repeated values are parsed once across slices
+
+            for row_idx, row in enumerate(data_rows):
+                if row_idx % progress_interval == 0:
+                    if is_canceled():
+                        return False
+                    set_progress(row_idx * 100 / total_rows)
+
+                # Parse the geometry column one feature batch at a time
+                slice_idx = row_idx % batch_size
+                if slice_idx == 0:
+                    geom_values = [r[geom_col_idx] for r in data_rows[row_idx:row_idx + batch_size]]
+                    geoms = parse_batch(geom_values, format_type, parsed=parsed)
+
+                attrs = row_attributes(row, get_attrs, numeric_columns)
+
+                # Parse geometry, handling null/invalid geometries
+                geom_value = geom_values[slice_idx]
+                if not geom_value or geom_value.isspace():
+                    add_null_row((row_idx + 1, row, attrs))  # Row number (1-indexed)
+                    if skip_invalid:
+                        continue
+                    geom = Geometry()  # Empty geometry
+                else:
+                    geom = geoms[slice_idx]
+                    if geom is None:
+                        add_invalid_row((row_idx + 1, row, attrs, geom_value))
+                        if skip_invalid:
+                            continue
+                        geom = Geometry()  # Empty geometry
+
+                # Create feature
+                feat = Feature(template)
+                feat.setGeometry(geom)
+                feat.setAttributes(attrs)
+                add_feature(feat)
+
+                if len(batch) >= batch_size:
+                    add_features(batch, fast_insert)
+                    imported_count += len(batch)
+                    batch.clear()
+
+        # Add remaining features
+        if batch:
+            add_features(batch, fast_insert)
+            imported_count += len(batch)
+            batch.clear()
+        layer.updateExtents()
+        self.imported_count = imported_count
+        self.null_count = len(self.null_geom_rows)
+        self.invalid_count = len(self.invalid_geom_rows)
+
+        return self._finish(layer)
+
+    def _finish(self, layer: QgsVectorLayer) -> bool:
+        """Save the layer if requested and hand it over to the GUI thread"""
+        if self.output_path and not self._write_layer(layer):
+            return False
+
+        self.setProgress(100)
+
+        # Hand the layer over to the GUI thread
+        layer.moveToThread(QCoreApplication.instance().thread())
+        self.layer = layer
+        return True
+
+    def _write_layer(self, layer: QgsVectorLayer) -> bool:
+        """Save the layer to output_path, replacing an existing file"""
+        output_path = self.output_path
+
+        # Determine driver from file extension
+        ext = os.path.splitext(output_path)[1].lower()
+        if ext == '.shp':
+            driver_name = 'ESRI Shapefile'
+        elif ext == '.geojson':
+            driver_name = 'GeoJSON'
+        else:
+            driver_name = 'GPKG'
+
+        # Remove existing file if it exists (for overwrite)
+        if os.path.exists(output_path):
+            try:
+                os.remove(output_path)
+                # For shapefiles, also remove associated files
+                if ext == '.shp':
+                    for ext2 in ['.shx', '.dbf', '.prj', '.cpg']:
+                        assoc_file = output_path[:-4] + ext2
+                        if os.path.exists(assoc_file):
+                            os.remove(assoc_file)
+            except Exception as e:
+                QgsMessageLog.logMessage(
+                    f"Warning: Could not remove existing file: {e}",
+                    'CSV Geometry Import', Qgis.Warning
+                )
+
+        # Write to file
+        options = QgsVectorFileWriter.SaveVectorOptions()
+        options.driverName = driver_name
+        options.fileEncoding = 'UTF-8'
+
+        error = QgsVectorFileWriter.writeAsVectorFormatV3(
+            layer, output_path, self.transform_context, options
+        )
+
+        if error[0] != QgsVectorFileWriter.NoError:
+            self.error = f'Failed to save layer to file:\n{error[1]}'
+            return False
+        return True
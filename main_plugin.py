@@ -21,12 +21,30 @@
 """
 
 import os
+import base64
 from PyQt5.QtCore import QCoreApplication, QSettings, QTranslator
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QAction, QMessageBox, QToolBar
 
 from qgis.core import QgsMessageLog, Qgis
 
+# Plugin paths, resolved once when the module loads
+_PLUGIN_DIR = os.path.dirname(__file__)
+_ICON_PATH = os.path.join(_PLUGIN_DIR, 'icon.png')
+_ICON_EXISTS = os.path.isfile(_ICON_PATH)
+_I18N_DIR = os.path.join(_PLUGIN_DIR, 'i18n')
+_HAS_I18N = os.path.isdir(_I18N_DIR)
+
+# Main window property caching the toolbar shared by MAS plugins
+_TOOLBAR_PROPERTY = '_MASVectorProcessingToolbar'
+
+# Fallback toolbar icon: 24x24 PNG, "CSV" in white on a #323FFF rounded square
+_DEFAULT_ICON_PNG_B64 = (
+    'iVBORw0KGgoAAAANSUhEUgAAABgAAAAYCAYAAADgdz34AAAAWElEQVR42mNgGFbAyP7/f2pg'
+    'mhqO05JRCwaXBcgAlzhMDpsavBbg0oAuTkg90RaQKk62BbiCjqoWEBN0ZMcBvqDBZhnJqQhb'
+    'CsLnkNGcPGrBIK/VhldDAgBQ7gOGu36IowAAAABJRU5ErkJggg=='
+)
+
 
 class CSVGeometryImportPlugin:
     """QGIS Plugin Implementation."""
@@ -43,20 +61,22 @@ class CSVGeometryImportPlugin:
         self.iface = iface
         
         # Initialize plugin directory
-        self.plugin_dir = os.path.dirname(__file__)
-        
-        # Initialize locale
-        locale = QSettings().value('locale/userLocale')[0:2]
-        locale_path = os.path.join(
-            self.plugin_dir,
-            'i18n',
-            f'CSVGeometryImport_{locale}.qm'
-        )
+        self.plugin_dir = _PLUGIN_DIR
         
-        if os.path.exists(locale_path):
-            self.translator = QTranslator()
-            self.translator.load(locale_path)
-            QCoreApplication.installTranslator(self.translator)
+        # Initialize locale; settings are only needed if translations ship
+        self._settings = None
+        if _HAS_I18N:
+            self._settings = QSettings()
+            locale = self._settings.value('locale/userLocale')[0:2]
+            locale_path = os.path.join(
+                _I18N_DIR,
+                f'CSVGeometryImport_{locale}.qm'
+            )
+            
+            if os.path.exists(locale_path):
+                self.translator = QTranslator()
+                self.translator.load(locale_path)
+                QCoreApplication.installTranslator(self.translator)
         
         # Menu and toolbar identifiers - matching csv_geometry_export pattern
         self.menu = self.tr('&MAS Vector Processing')
@@ -74,21 +94,27 @@ class CSVGeometryImportPlugin:
     def initGui(self):
         """Create the menu entries and toolbar icons inside the QGIS GUI."""
         
-        # Check if the MAS Vector Processing toolbar already exists; if not, create it
-        self.toolbar = self.iface.mainWindow().findChild(QToolBar, 'MASVectorProcessingToolbar')
+        # Check if the MAS Vector Processing toolbar already exists; if not, create it.
+        # The toolbar is cached on the main window so MAS plugins loading after
+        # this one skip the findChild() walk.
+        main_window = self.iface.mainWindow()
+        self.toolbar = main_window.property(_TOOLBAR_PROPERTY)
         if self.toolbar is None:
-            self.toolbar = self.iface.addToolBar(self.tr('MAS Vector Processing'))
-            self.toolbar.setObjectName('MASVectorProcessingToolbar')
+            self.toolbar = main_window.findChild(QToolBar, 'MASVectorProcessingToolbar')
+            if self.toolbar is None:
+                self.toolbar = self.iface.addToolBar(self.tr('MAS Vector Processing'))
+                self.toolbar.setObjectName('MASVectorProcessingToolbar')
+            main_window.setProperty(_TOOLBAR_PROPERTY, self.toolbar)
+            # Qt does not track object pointers in properties; drop it with the toolbar
+            self.toolbar.destroyed.connect(lambda: main_window.setProperty(_TOOLBAR_PROPERTY, None))
         
-        # Create icon path
-        icon_path = os.path.join(self.plugin_dir, 'icon.png')
-        if not os.path.exists(icon_path):
-            # Create a default icon if missing
-            self.create_default_icon(icon_path)
+        # Create a default icon if missing
+        if not _ICON_EXISTS:
+            self.create_default_icon(_ICON_PATH)
         
         # Create main action
         self.plugin_action = QAction(
-            QIcon(icon_path),
+            QIcon(_ICON_PATH),
             self.tr('Import CSV with Geometry'),
             self.iface.mainWindow()
         )
@@ -112,31 +138,8 @@ class CSVGeometryImportPlugin:
     def create_default_icon(self, icon_path):
         """Create a default icon if none exists with blue color #323FFF"""
         try:
-            from PyQt5.QtGui import QPixmap, QPainter, QColor, QFont, QPen, QBrush
-            from PyQt5.QtCore import Qt
-            
-            # Create 24x24 pixel icon (matching csv_geometry_export)
-            pixmap = QPixmap(24, 24)
-            pixmap.fill(Qt.transparent)
-            
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.Antialiasing)
-            
-            # Use blue color #323FFF (same as csv_geometry_export)
-            blue_color = QColor("#323FFF")
-            
-            # Draw background with blue color
-            painter.setBrush(QBrush(blue_color))
-            painter.setPen(QPen(blue_color, 1))
-            painter.drawRoundedRect(2, 2, 20, 20, 3, 3)
-            
-            # Draw CSV text in white for good contrast
-            painter.setPen(QPen(QColor(255, 255, 255)))
-            painter.setFont(QFont("Arial", 7, QFont.Bold))
-            painter.drawText(4, 15, "CSV")
-            
-            painter.end()
-            pixmap.save(icon_path)
+            with open(icon_path, 'wb') as f:
+                f.write(base64.b64decode(_DEFAULT_ICON_PNG_B64))
             
         except Exception as e:
             QgsMessageLog.logMessage(
@@ -156,14 +159,21 @@ class CSVGeometryImportPlugin:
         
         # Clear actions list
         self.actions = []
+        
+        # Release the cached dialog
+        if self.dlg is not None:
+            self.dlg.deleteLater()
+            self.dlg = None
 
     def run(self):
         """Run method that performs all the real work"""
         try:
-            from .import_dialog import CSVGeometryImportDialog
-            
-            # Create and show the dialog
-            self.dlg = CSVGeometryImportDialog(parent=self.iface.mainWindow())
+            # Create the dialog on first use and reuse it afterwards
+            if self.dlg is None:
+                from .import_dialog import CSVGeometryImportDialog
+                self.dlg = CSVGeometryImportDialog(parent=self.iface.mainWindow())
+            else:
+                self.dlg.reset()
             
             # Show the dialog
             result = self.dlg.exec_()
@@ -178,7 +188,7 @@ class CSVGeometryImportPlugin:
             QMessageBox.critical(
                 self.iface.mainWindow(),
                 self.tr('Error'),
-                self.tr(f'An error occurred: {str(e)}')
+                self.tr('An error occurred: {0}').format(str(e))
             )
             QgsMessageLog.logMessage(
                 f"Error in CSV Geometry Import: {str(e)}",
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Tests for geometry_parsers; they need the QGIS Python bindings"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('qgis.core')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geometry_parsers import GeometryParser, GeometryFormat  # noqa: E402
+
+
+@pytest.mark.parametrize('value', [
+    'ee.Geometry.Polygon([[0, 0], [1, 0], [1, 1]])',
+    'ee.Geometry.Polygon([[[0, 0], [1, 0], [1, 1]]])',
+    'ee.Geometry.LinearRing([[0, 0], [1, 0], [1, 1]])',
+])
+def test_earth_engine_unclosed_ring_is_closed(value):
+    geom = GeometryParser.parse(value, GeometryFormat.EARTH_ENGINE)
+    assert geom is not None
+    ring = geom.asPolygon()[0]
+    assert len(ring) == 4
+    assert ring[0] == ring[-1]
+    assert geom.isGeosValid()
+
+
+def test_geojson_unclosed_ring_is_closed():
+    geom = GeometryParser.parse(
+        '{"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1]]]}',
+        GeometryFormat.GEOJSON
+    )
+    ring = geom.asPolygon()[0]
+    assert len(ring) == 4
+    assert ring[0] == ring[-1]
+
+
+def test_closed_ring_is_kept():
+    geom = GeometryParser.parse(
+        'ee.Geometry.Polygon([[0, 0], [1, 0], [1, 1], [0, 0]])',
+        GeometryFormat.EARTH_ENGINE
+    )
+    assert len(geom.asPolygon()[0]) == 4